@@ -17,10 +17,11 @@ import json
 import hashlib
 import logging
 import uuid
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime, timedelta
 import httpx # For URL validation
-from typing import Optional
+from typing import AsyncIterator, Optional
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from google.adk.models import Gemini
@@ -87,6 +88,8 @@ if SEARCH_PROVIDER == "GOOGLE" and not GOOGLE_CSE_ID:
 CACHE_ENABLED = True
 CACHE_DIR = ".cache"
 CACHE_TTL_HOURS = 24
+# Set GS_CACHE_BUST=1 to ignore (and overwrite) cached full-workflow results
+CACHE_BUST = os.getenv("GS_CACHE_BUST", "").lower() in ("1", "true", "yes")
 
 # Retry configuration
 RETRY_ATTEMPTS = 1
@@ -94,6 +97,23 @@ RETRY_EXP_BASE = 2
 RETRY_INITIAL_DELAY = 1.0
 RETRY_STATUS_CODES = [429, 500, 503, 504]
 
+# US state names used to reject non-Canadian grants by geography.
+# Compiled into one alternation so each check is a single scan of the string
+# instead of one substring search per state.
+US_STATES = (
+    'alabama', 'alaska', 'arizona', 'arkansas', 'california', 'colorado',
+    'connecticut', 'delaware', 'florida', 'georgia', 'hawaii', 'idaho',
+    'illinois', 'indiana', 'iowa', 'kansas', 'kentucky', 'louisiana',
+    'maine', 'maryland', 'massachusetts', 'michigan', 'minnesota',
+    'mississippi', 'missouri', 'montana', 'nebraska', 'nevada',
+    'new hampshire', 'new jersey', 'new mexico', 'new york',
+    'north carolina', 'north dakota', 'ohio', 'oklahoma', 'oregon',
+    'pennsylvania', 'rhode island', 'south carolina', 'south dakota',
+    'tennessee', 'texas', 'utah', 'vermont', 'virginia', 'washington',
+    'west virginia', 'wisconsin', 'wyoming'
+)
+US_STATES_PATTERN = re.compile('|'.join(re.escape(state) for state in US_STATES))
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # Helper functions for date handling, string normalization, and cleaning.
@@ -107,6 +127,10 @@ def get_current_date() -> tuple[str, str]:
         now.strftime("%Y-%m-%d")
     )
 
+def lead_key(url: str) -> str:
+    """Short fixed-size hash identifying a lead by its URL."""
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
 def normalize_value(value: str | None, default: str) -> str:
     """Convert empty strings, None, or whitespace-only strings to default value."""
     if value is None or (isinstance(value, str) and not value.strip()):
@@ -504,6 +528,9 @@ class GrantSeekerWorkflow:
         if CACHE_ENABLED:
             self.cache = CacheService(cache_dir=CACHE_DIR, ttl_hours=CACHE_TTL_HOURS)
         
+        # In-flight run_cached() tasks, so identical concurrent queries share one run
+        self._run_tasks: dict[str, asyncio.Task] = {}
+        
         # Initialize Search Clients
         # 1. Google Client (for Discovery/Phase 1)
         self.google_client = None
@@ -533,6 +560,12 @@ class GrantSeekerWorkflow:
         self.extractor_agent = create_extractor_agent()
         self.query_agent = create_query_agent()
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections held by the search clients."""
+        await self.tavily.aclose()
+        if self.google_client:
+            await self.google_client.aclose()
+
     def _is_grant_expired(self, grant_data: dict) -> bool:
         """Check if a grant is expired based on its deadline."""
         deadline = grant_data.get('deadline', '')
@@ -577,25 +610,8 @@ class GrantSeekerWorkflow:
         if 'usa' in geography or 'united states' in geography or 'not applicable' in geography:
             return True
         
-        # Check for US state names (common ones)
-        us_states = [
-            'alabama', 'alaska', 'arizona', 'arkansas', 'california', 'colorado',
-            'connecticut', 'delaware', 'florida', 'georgia', 'hawaii', 'idaho',
-            'illinois', 'indiana', 'iowa', 'kansas', 'kentucky', 'louisiana',
-            'maine', 'maryland', 'massachusetts', 'michigan', 'minnesota',
-            'mississippi', 'missouri', 'montana', 'nebraska', 'nevada',
-            'new hampshire', 'new jersey', 'new mexico', 'new york',
-            'north carolina', 'north dakota', 'ohio', 'oklahoma', 'oregon',
-            'pennsylvania', 'rhode island', 'south carolina', 'south dakota',
-            'tennessee', 'texas', 'utah', 'vermont', 'virginia', 'washington',
-            'west virginia', 'wisconsin', 'wyoming'
-        ]
-        
-        for state in us_states:
-            if state in geography:
-                return True
-        
-        return False
+        # Check for US state names (common ones) in a single regex scan
+        return US_STATES_PATTERN.search(geography) is not None
 
 
 
@@ -884,7 +900,12 @@ class GrantSeekerWorkflow:
         logger.info(f"Successfully extracted {len(final_grants)} grants from {lead.url}")
         return final_grants
     
-    async def run(self, query: str) -> list[dict]:
+    async def run(
+        self,
+        query: str,
+        concurrency: asyncio.Semaphore | None = None,
+        seen_leads: set[str] | None = None
+    ) -> list[dict]:
         """
         Run the complete grant seeking workflow.
         
@@ -893,7 +914,16 @@ class GrantSeekerWorkflow:
         1. Phase 0: Generate a search query from the user's input.
         2. Phase 1: Search the web and identify promising leads.
         3. Phase 2: Extract detailed data from those leads in parallel.
+        
+        If a `concurrency` semaphore is given, every search and extraction call
+        holds it while running, capping in-flight upstream requests across all
+        runs that share it.
+        
+        If a `seen_leads` set is given, leads whose URL hash is already in it are
+        skipped (another run sharing the set extracts them) and the rest are added.
+        A lead whose extraction fails is removed again, so a later run retries it.
         """
+        limit = concurrency or nullcontext()
         logger.info(f"Starting Grant Seeker Workflow with {MODEL_NAME}")
         
         # Create main session
@@ -910,13 +940,26 @@ class GrantSeekerWorkflow:
         
         # Phase 1: Search and identify promising grants
         logger.info(f"Phase 1: Searching for Grants with query: {search_query}")
-        search_results = await self.search_grants(search_query)
+        async with limit:
+            search_results = await self.search_grants(search_query)
         
         if not search_results:
             logger.warning("No search results found")
             return []
         
-        leads = await self.analyze_results(search_results, main_session_id)
+        async with limit:
+            leads = await self.analyze_results(search_results, main_session_id)
+        
+        if seen_leads is not None:
+            new_leads = []
+            for lead in leads:
+                lead_hash = lead_key(lead.url)
+                if lead_hash not in seen_leads:
+                    seen_leads.add(lead_hash)
+                    new_leads.append(lead)
+            if len(new_leads) < len(leads):
+                logger.info(f"Skipping {len(leads) - len(new_leads)} leads already extracted in this search")
+            leads = new_leads
         
         if not leads:
             logger.warning("No promising grants identified")
@@ -929,8 +972,17 @@ class GrantSeekerWorkflow:
         sem = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
         
         async def extract_with_semaphore(lead):
-            async with sem:
-                return await self.extract_grant_data(lead, query)
+            async with sem, limit:
+                try:
+                    grants = await self.extract_grant_data(lead, query)
+                except BaseException:
+                    if seen_leads is not None:
+                        seen_leads.discard(lead_key(lead.url))
+                    raise
+            if seen_leads is not None and any('error' in g for g in grants):
+                # Failed extraction: let another variant of the search retry it
+                seen_leads.discard(lead_key(lead.url))
+            return grants
         
         # Process all leads concurrently
         tasks = [extract_with_semaphore(lead) for lead in leads]
@@ -1014,48 +1066,119 @@ class GrantSeekerWorkflow:
         logger.info("Workflow complete")
         return results
 
-    async def run_with_minimum_results(self, query: str, filters: dict = None, min_results: int = 3):
+    async def run_cached(self, query: str, force_fresh: bool = False) -> list[dict]:
         """
-        Iteratively search until minimum RELEVANT results found.
+        Run the workflow, reusing the result list of an identical earlier query.
+        
+        Results are stored in the file cache (so re-runs within the TTL skip the
+        network entirely), and identical queries issued concurrently await the
+        same in-flight run instead of starting their own. The cache key includes
+        MODEL_NAME, so switching models never serves another model's results.
+        
+        With `force_fresh` (or GS_CACHE_BUST set) the cached entry is ignored and
+        replaced by the result of a fresh run.
+        """
+        cache_key = f"run:{MODEL_NAME}:{query}"
+        if self.cache and not (force_fresh or CACHE_BUST):
+            cached_results = self.cache.get(cache_key)
+            if cached_results is not None:
+                logger.info(f"Using cached workflow results for: {query}")
+                return cached_results
+        
+        task = self._run_tasks.get(query)
+        if task is None:
+            task = asyncio.ensure_future(self.run(query))
+            self._run_tasks[query] = task
+            
+            def finish(done):
+                # Runs however the creating caller exits, so a cancelled caller
+                # neither leaks the entry nor skips the cache write
+                del self._run_tasks[query]
+                if done.cancelled() or done.exception() is not None:
+                    return
+                results = done.result()
+                if self.cache and results:
+                    self.cache.set(cache_key, results)
+            
+            task.add_done_callback(finish)
+        
+        # Every caller shields the shared run, so cancelling one caller never
+        # cancels the run the others are waiting on
+        return await asyncio.shield(task)
+
+    async def run_with_minimum_results(
+        self,
+        query: str,
+        filters: dict = None,
+        min_results: int = 3,
+        concurrency: asyncio.Semaphore | None = None
+    ):
+        """
+        Search until minimum RELEVANT results found.
+        
+        The query itself is run first; if that falls short, the broader query
+        variants are all run concurrently (see `iter_minimum_results`).
         
         Args:
             query: User search query
             filters: Dictionary of advanced filters (optional)
             min_results: Target number of relevant grants
+            concurrency: Optional semaphore capping in-flight search/extraction
+                calls (see `run`)
             
         Returns:
             List of unique, relevant, filtered grants
         """
-        all_results = []
-        attempted_queries = set()
-        attempt = 1
+        all_results = [
+            grant async for grant in self.iter_minimum_results(
+                query, filters=filters, min_results=min_results, concurrency=concurrency
+            )
+        ]
+        
+        logger.info(f"✅ Iterative search complete. Found {len(all_results)} total relevant grants.")
+        
+        # Rank by multi-factor score (Relevance + Completeness + Freshness)
+        return self._rank_results(all_results, query)
+
+    async def iter_minimum_results(
+        self,
+        query: str,
+        filters: dict = None,
+        min_results: int = 3,
+        concurrency: asyncio.Semaphore | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Yield unique, relevant grants as soon as each search attempt finishes.
+        
+        Takes the same arguments as `run_with_minimum_results`, but yields grants
+        unranked, so callers can show the first results while the broader
+        variants are still running.
+        
+        Breaking out of ``async for`` does not close an async generator, so a
+        caller that stops early must ``await gen.aclose()`` (or iterate inside
+        ``contextlib.aclosing(...)``); closing it cancels the variant runs
+        still in flight.
+        """
         MAX_SEARCH_ATTEMPTS = 5
         
         # We need to filter results to check if we met the target.
         # However, we want to return ALL extracted data, even if it doesn't match filters?
         # No, user asked for RELEVANT results. So we should only count/return filtered ones.
         
-
-
+        # Query variants for every attempt, in attempt order, without repeats
+        variants = list(dict.fromkeys(
+            self._generate_search_variant(query, filters, attempt)
+            for attempt in range(1, MAX_SEARCH_ATTEMPTS + 1)
+        ))
         
-        # Track seen URLs to avoid duplicates across attempts
+        # Track seen URLs to avoid duplicates across attempts, and hashes of the
+        # leads already extracted so overlapping variants skip the LLM extraction
         seen_urls = set()
+        seen_leads = set()
+        found = 0
         
-        while len(all_results) < min_results and attempt <= MAX_SEARCH_ATTEMPTS:
-            # Generate query variant
-            search_query = self._generate_search_variant(query, filters, attempt)
-            
-            # Skip if already tried
-            if search_query in attempted_queries:
-                attempt += 1
-                continue
-            
-            attempted_queries.add(search_query)
-            logger.info(f"🔄 Search Attempt {attempt}/{MAX_SEARCH_ATTEMPTS}: '{search_query}' (Need {min_results}, Have {len(all_results)})")
-            
-            # Run extraction workflow (standard run)
-            results = await self.run(search_query)
-            
+        def relevant_new(search_query, results):
+            """Return the grants of one attempt that are new and match the filters."""
             # Filter duplicates immediately
             new_unique_results = []
             for grant in results:
@@ -1065,28 +1188,56 @@ class GrantSeekerWorkflow:
                     new_unique_results.append(grant)
             
             if not new_unique_results:
-                logger.info(f"   No new unique results found in attempt {attempt}")
-                attempt += 1
-                continue
+                logger.info(f"   No new unique results found for '{search_query}'")
+                return []
                 
             # Apply filters to check relevance
             relevant_batch = new_unique_results
             if apply_filters_to_results and filters:
                 relevant_batch = apply_filters_to_results(new_unique_results, filters)
             
-            count_new = len(relevant_batch)
-            logger.info(f"   Found {count_new} new relevant grants in this batch")
-            
-            all_results.extend(relevant_batch)
-            attempt += 1
-            
-            # Small delay to be nice to APIs
-            # await asyncio.sleep(1) 
-            
-        logger.info(f"✅ Iterative search complete. Found {len(all_results)} total relevant grants.")
+            logger.info(f"   Found {len(relevant_batch)} new relevant grants for '{search_query}'")
+            return relevant_batch
+        
+        # Attempt 1 is the user's own query; it usually meets the target on its own
+        logger.info(f"🔄 Search Attempt 1/{len(variants)}: '{variants[0]}' (Need {min_results})")
+        for grant in relevant_new(variants[0], await self.run(variants[0], concurrency=concurrency, seen_leads=seen_leads)):
+            found += 1
+            yield grant
+        
+        if found >= min_results or len(variants) == 1:
+            return
+        
+        # Otherwise the remaining variants are independent, so run them as one
+        # concurrent batch instead of one attempt after another
+        remaining = variants[1:]
+        logger.info(
+            f"🔄 Search Attempts 2-{len(variants)}: {remaining} "
+            f"(Need {min_results}, Have {found})"
+        )
         
-        # Rank by multi-factor score (Relevance + Completeness + Freshness)
-        return self._rank_results(all_results, query)
+        async def run_variant(search_query):
+            try:
+                return search_query, await self.run(search_query, concurrency=concurrency, seen_leads=seen_leads)
+            except Exception as e:
+                return search_query, e
+        
+        tasks = [asyncio.ensure_future(run_variant(v)) for v in remaining]
+        try:
+            # Yield each variant's grants as soon as that variant finishes
+            for next_done in asyncio.as_completed(tasks):
+                search_query, results = await next_done
+                if isinstance(results, Exception):
+                    logger.warning(f"   Search attempt '{search_query}' failed: {results}")
+                    continue
+                for grant in relevant_new(search_query, results):
+                    yield grant
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancelled runs to unwind so none is still using the
+            # pooled HTTP clients when the caller closes the workflow
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     def _generate_search_variant(self, query: str, filters: dict, attempt: int) -> str:
         """Generate broader or related query variants."""
@@ -12,6 +12,7 @@ This module solves the "Untitled Grant" problem caused by failed content extract
 
 import httpx
 import logging
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional, Tuple
 from bs4 import BeautifulSoup
@@ -202,41 +203,62 @@ class RobustContentExtractor:
         return url_lower.endswith('.pdf') or '/pdf/' in url_lower or '.pdf?' in url_lower
 
 
+# Placeholder values that do not count as a real title / deadline / amount
+_MISSING_TITLES = ('Untitled Grant', '', 'N/A')
+_MISSING_VALUES = ('Not specified', '', 'N/A', 'Unknown')
+
+
 def is_viable_grant(grant: dict) -> bool:
     """
     Check if a grant has minimum viable information to show to users.
     
+    The decision depends only on a few scalar fields, so it is memoized on
+    them; iterative search sees the same grants again across query variants.
+    
     Args:
         grant: Grant dictionary
         
     Returns:
         True if grant has sufficient data, False otherwise
     """
+    description = grant.get('description', '')
+    key = (
+        bool(grant.get('error')),
+        grant.get('title'),
+        grant.get('deadline'),
+        grant.get('amount'),
+        len(description) if description else 0,
+    )
+    try:
+        return _is_viable_cached(*key)
+    except TypeError:
+        # Unhashable field value (e.g. a list from a malformed extraction)
+        return _is_viable_cached.__wrapped__(*key)
+
+
+@lru_cache(maxsize=4096)
+def _is_viable_cached(has_error: bool, title, deadline, amount, description_length: int) -> bool:
+    """Viability decision for is_viable_grant, keyed on the fields it reads."""
     # Check for error field
-    if grant.get('error'):
+    if has_error:
         return False
     
     # Must have at least 2 of these 3 critical fields with real values
-    has_title = grant.get('title') and grant['title'] not in ['Untitled Grant', '', 'N/A']
-    has_deadline = grant.get('deadline') and grant['deadline'] not in ['Not specified', '', 'N/A', 'Unknown']
-    has_amount = grant.get('amount') and grant['amount'] not in ['Not specified', '', 'N/A', 'Unknown']
+    has_title = bool(title) and title not in _MISSING_TITLES
+    has_deadline = bool(deadline) and deadline not in _MISSING_VALUES
+    has_amount = bool(amount) and amount not in _MISSING_VALUES
     
-    critical_fields_count = sum([has_title, has_deadline, has_amount])
+    critical_fields_count = has_title + has_deadline + has_amount
     
     # Must have at least 2 out of 3 critical fields
     if critical_fields_count < 2:
         logger.debug(f"Grant rejected: Only {critical_fields_count}/3 critical fields present")
         return False
     
-    # Must have some meaningful description
-    description = grant.get('description', '')
-    if not description or description in ['No description available', '', 'N/A']:
-        logger.debug(f"Grant rejected: No meaningful description")
-        return False
-    
-    # Description should be substantial (at least 50 characters)
-    if len(description) < 50:
-        logger.debug(f"Grant rejected: Description too short ({len(description)} chars)")
+    # Must have some meaningful description, at least 50 characters.
+    # (The "No description available" / "N/A" placeholders are all shorter.)
+    if description_length < 50:
+        logger.debug(f"Grant rejected: Description too short ({description_length} chars)")
         return False
     
     return True
@@ -4,6 +4,60 @@ Extracted to resolve circular dependencies between frontend and backend.
 """
 import re
 
+# Keyword expansion map for the demographic filter
+DEMOGRAPHIC_KEYWORDS = {
+    'women': ('women', 'woman', 'female', 'girl'),
+    'indigenous': ('indigenous', 'first nations', 'inuit', 'métis', 'aboriginal'),
+    'youth': ('youth', 'young', 'student')
+}
+
+
+def expand_demographic_terms(demographic_focus):
+    """
+    Build the set of lowercase search terms for the selected demographics.
+    
+    Each selection matches itself plus the synonyms of any DEMOGRAPHIC_KEYWORDS
+    key it contains (e.g. "Women-led / Female Founders" also matches "female").
+    """
+    search_terms = set()
+    for demo_filter in demographic_focus:
+        demo_lower = demo_filter.lower()
+        search_terms.add(demo_lower)
+        for key, terms in DEMOGRAPHIC_KEYWORDS.items():
+            if key in demo_lower:
+                search_terms.update(terms)
+    return search_terms
+
+
+def check_funding_match(grant_str, filter_str):
+    """Check whether a grant's funding nature satisfies one funding-type filter."""
+    g = grant_str.lower()
+    f = filter_str.lower()
+    
+    if 'grant' in f: # User wants Non-repayable / Grant
+        # Explicit reject if it's strictly a loan/repayable
+        if 'loan' in g: return False
+        if 'repayable' in g and 'non-repayable' not in g: return False
+        
+        # Accept if it looks like free money
+        # Note: Many Canadian grants are called "Contributions" or "Funds"
+        return ('grant' in g or 
+                'contribution' in g or 
+                'non-repayable' in g or 
+                'fund' in g or
+                'award' in g or
+                'bursary' in g)
+                
+    if 'loan' in f: # User wants Loan
+        return ('loan' in g or 
+                'repayable' in g or 
+                'debt' in g or 
+                'financing' in g)
+    
+    # Fallback for other types (Tax Credit, Wage Subsidy)
+    return f in g or g in f
+
+
 def apply_filters_to_results(results, filters):
     """
     Apply Advanced Filters to real backend search results.
@@ -29,11 +83,15 @@ def apply_filters_to_results(results, filters):
     if not filters:
         return results
     
+    # Expand the selected demographics into search terms once per call,
+    # rather than once per grant inside the loop below
+    demographic_terms = expand_demographic_terms(filters.get('demographic_focus') or [])
+    
     filtered = []
     
     for grant in results:
         # Filter 1: Demographic Focus - STRICT matching
-        if filters.get('demographic_focus'):
+        if demographic_terms:
             grant_demographics = grant.get('founder_demographics', [])
             
             # Must have demographics field populated
@@ -41,30 +99,8 @@ def apply_filters_to_results(results, filters):
                 continue
             
             # Check if grant matches ANY of the selected demographics
-            demographic_match = False
-            
-            # Keyword expansion map
-            keyword_map = {
-                'women': ['women', 'woman', 'female', 'girl'],
-                'indigenous': ['indigenous', 'first nations', 'inuit', 'métis', 'aboriginal'],
-                'youth': ['youth', 'young', 'student']
-            }
-
-            for demo_filter in filters['demographic_focus']:
-                demo_lower = demo_filter.lower()
-                
-                # Build search terms
-                search_terms = {demo_lower}
-                for key, terms in keyword_map.items():
-                    if key in demo_lower:
-                        search_terms.update(terms)
-                
-                # Check for match against grant data
-                if any(term in gd.lower() for gd in grant_demographics for term in search_terms):
-                    demographic_match = True
-                    break
-            
-            if not demographic_match:
+            grant_demographics_lower = [gd.lower() for gd in grant_demographics]
+            if not any(term in gd for gd in grant_demographics_lower for term in demographic_terms):
                 continue
         
         # Filter 2: Funding Amount Range
@@ -102,34 +138,6 @@ def apply_filters_to_results(results, filters):
         # Filter 3: Funding Type
         if filters.get('funding_types'):
             grant_funding_type = grant.get('funding_nature', '').lower()
-            
-            def check_funding_match(grant_str, filter_str):
-                g = grant_str.lower()
-                f = filter_str.lower()
-                
-                if 'grant' in f: # User wants Non-repayable / Grant
-                    # Explicit reject if it's strictly a loan/repayable
-                    if 'loan' in g: return False
-                    if 'repayable' in g and 'non-repayable' not in g: return False
-                    
-                    # Accept if it looks like free money
-                    # Note: Many Canadian grants are called "Contributions" or "Funds"
-                    return ('grant' in g or 
-                            'contribution' in g or 
-                            'non-repayable' in g or 
-                            'fund' in g or
-                            'award' in g or
-                            'bursary' in g)
-                            
-                if 'loan' in f: # User wants Loan
-                    return ('loan' in g or 
-                            'repayable' in g or 
-                            'debt' in g or 
-                            'financing' in g)
-                
-                # Fallback for other types (Tax Credit, Wage Subsidy)
-                return f in g or g in f
-
             type_match = any(check_funding_match(grant_funding_type, ft) for ft in filters['funding_types'])
             
             if not type_match:
@@ -9,6 +9,8 @@ class GoogleSearchClient:
     """
     Wrapper for Google Custom Search JSON API.
     Designed to be drop-in compatible with the TavilyClient usage in Grant Seeker.
+    API calls and page scrapes each reuse one pooled HTTP client, so only the
+    first request pays for the TCP/TLS handshake. Call `aclose()` when done.
     """
     
     def __init__(self, api_key: str, cse_id: str, max_retries: int = 3, timeout: float = 30.0):
@@ -22,6 +24,51 @@ class GoogleSearchClient:
         self.scraper_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        
+        # Shared HTTP clients, created lazily inside the running event loop
+        self._api_client: Optional[httpx.AsyncClient] = None
+        self._scrape_client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+    
+    def _check_loop(self) -> None:
+        """Drop clients created in a previous event loop; they cannot be reused."""
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            # Dropped, not closed: their connections belong to the previous loop
+            # and can't be closed from this one. Call aclose() before that loop
+            # ends to release them cleanly.
+            self._api_client = None
+            self._scrape_client = None
+            self._client_loop = loop
+    
+    def _get_api_client(self) -> httpx.AsyncClient:
+        """Return the shared client for Custom Search API calls."""
+        self._check_loop()
+        if self._api_client is None or self._api_client.is_closed:
+            self._api_client = httpx.AsyncClient(timeout=self.timeout)
+        return self._api_client
+    
+    def _get_scrape_client(self) -> httpx.AsyncClient:
+        """Return the shared client for scraping result pages."""
+        self._check_loop()
+        if self._scrape_client is None or self._scrape_client.is_closed:
+            self._scrape_client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, verify=False)
+        return self._scrape_client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients and their pooled connections."""
+        for client in (self._api_client, self._scrape_client):
+            if client is not None and not client.is_closed:
+                await client.aclose()
+        self._api_client = None
+        self._scrape_client = None
+        self._client_loop = None
+    
+    async def __aenter__(self) -> "GoogleSearchClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def search(
         self, 
@@ -57,23 +104,22 @@ class GoogleSearchClient:
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(self.base_url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    items = data.get('items', [])
-                    results = []
+                response = await self._get_api_client().get(self.base_url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                
+                items = data.get('items', [])
+                results = []
+                
+                for item in items:
+                    results.append({
+                        "url": item.get('link'),
+                        "title": item.get('title'),
+                        "content": item.get('snippet', ''),
+                        "raw_content": item.get('snippet', '') # Google doesn't return raw HTML
+                    })
                     
-                    for item in items:
-                        results.append({
-                            "url": item.get('link'),
-                            "title": item.get('title'),
-                            "content": item.get('snippet', ''),
-                            "raw_content": item.get('snippet', '') # Google doesn't return raw HTML
-                        })
-                        
-                    return results
+                return results
 
             except httpx.HTTPStatusError as e:
                 print(f"❌ Google Search HTTP error: {e.response.status_code} - {e.response.reason_phrase}")
@@ -107,25 +153,24 @@ class GoogleSearchClient:
         """
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, verify=False) as client:
-                    response = await client.get(url, headers=self.scraper_headers)
-                    response.raise_for_status()
-                    
-                    # Basic extraction using BeautifulSoup
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Remove scripts and styles
-                    for script in soup(["script", "style", "nav", "footer", "header"]):
-                        script.decompose()
-                        
-                    text = soup.get_text(separator='\n')
-                    
-                    # Basic cleaning
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = '\n'.join(chunk for chunk in chunks if chunk)
+                response = await self._get_scrape_client().get(url, headers=self.scraper_headers)
+                response.raise_for_status()
+                
+                # Basic extraction using BeautifulSoup
+                soup = BeautifulSoup(response.text, 'html.parser')
+                
+                # Remove scripts and styles
+                for script in soup(["script", "style", "nav", "footer", "header"]):
+                    script.decompose()
                     
-                    return text
+                text = soup.get_text(separator='\n')
+                
+                # Basic cleaning
+                lines = (line.strip() for line in text.splitlines())
+                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+                text = '\n'.join(chunk for chunk in chunks if chunk)
+                
+                return text
                     
             except httpx.HTTPStatusError as e:
                 print(f"❌ Scrape HTTP error for {url}")
@@ -1,8 +1,13 @@
 """Tavily API Client Wrapper"""
 import httpx
+from functools import lru_cache
 from typing import List, Dict, Optional
 import asyncio
 
+# Connection pool sizing for the shared HTTP client. Idle connections are kept
+# alive for 30s so back-to-back requests skip the TCP/TLS handshake.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
 class TavilyClient:
     """
     Wrapper for Tavily API with retry logic, error handling, and rate limiting.
@@ -12,13 +17,55 @@ class TavilyClient:
     - **Retries**: Automatically retries failed requests.
     - **Exponential Backoff**: Waits longer between each retry to avoid overwhelming the server.
     - **Timeout Handling**: Prevents the app from hanging indefinitely if the API is slow.
+    - **Connection Reuse**: One pooled HTTP client serves every request, so only
+      the first call pays for the TCP/TLS handshake. Call `aclose()` when done.
     """
     
-    def __init__(self, api_key: str, max_retries: int = 3, timeout: float = 30.0):
+    def __init__(
+        self,
+        api_key: str,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        limits: httpx.Limits = DEFAULT_LIMITS
+    ):
         self.api_key = api_key
         self.max_retries = max_retries
         self.timeout = timeout
+        self.limits = limits
         self.base_url = "https://api.tavily.com"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use in this event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            # A client is bound to the loop that created it, so a new loop
+            # (e.g. a fresh asyncio.run) gets a new client. The old one is
+            # dropped, not closed: its connections belong to the previous loop
+            # and can't be closed from this one. Call aclose() before that
+            # loop ends to release them cleanly.
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=self.limits,
+                follow_redirects=True,
+                verify=True
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
+    async def __aenter__(self) -> "TavilyClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def search(
         self, 
@@ -60,16 +107,10 @@ class TavilyClient:
         
         for attempt in range(self.max_retries):
             try:
-                # Create client with more lenient settings
-                async with httpx.AsyncClient(
-                    timeout=httpx.Timeout(self.timeout, connect=10.0),
-                    follow_redirects=True,
-                    verify=True
-                ) as client:
-                    response = await client.post(url, json=payload)
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("results", [])
+                response = await self._get_client().post(url, json=payload)
+                response.raise_for_status()
+                data = response.json()
+                return data.get("results", [])
             except httpx.ConnectTimeout:
                 print(f"⚠️ Connection timeout (attempt {attempt + 1}/{self.max_retries})")
                 print(f"   Query: '{query}'")
@@ -114,16 +155,15 @@ class TavilyClient:
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, json=payload)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # Return dict mapping URL -> content
-                    result = {}
-                    for item in data.get("results", []):
-                        result[item.get("url", "")] = item.get("raw_content", "")
-                    return result
+                response = await self._get_client().post(url, json=payload)
+                response.raise_for_status()
+                data = response.json()
+                
+                # Return dict mapping URL -> content
+                result = {}
+                for item in data.get("results", []):
+                    result[item.get("url", "")] = item.get("raw_content", "")
+                return result
             except httpx.HTTPStatusError as e:
                 print(f"❌ Tavily Extract HTTP error: {e.response.status_code} - {e.response.reason_phrase}")
                 print(f"   URLs: {urls}")
@@ -151,3 +191,15 @@ class TavilyClient:
         """Get content for a single URL"""
         result = await self.extract([url])
         return result.get(url, "")
+
+
+@lru_cache(maxsize=None)
+def shared_tavily_client(api_key: str, max_retries: int = 3, timeout: float = 30.0) -> TavilyClient:
+    """
+    Return one TavilyClient per configuration for the whole process.
+    
+    Scripts that probe several URLs (or call several test functions) reuse the
+    same client and so the same pooled connections. The client recreates its
+    HTTP connection pool when used from a new event loop.
+    """
+    return TavilyClient(api_key=api_key, max_retries=max_retries, timeout=timeout)
@@ -1,8 +1,12 @@
 import os
 import asyncio
+import queue
+import threading
 import uuid
+from typing import Optional
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
@@ -55,7 +59,53 @@ writer_agent = LlmAgent(
     """
 )
 
-# --- The Interface Function ---
+# --- Helpers ---
+def _build_prompt(project_details: str, grant_json: dict) -> str:
+    """Format the project description and grant details into the writer prompt."""
+    grant_context = f"""
+    Target Grant: {grant_json.get('source', 'Unknown Funder')}
+    URL: {grant_json.get('url')}
+    Eligibility: {grant_json.get('eligibility', 'Not specified')}
+    Budget: {grant_json.get('budget', 'Not specified')}
+    Deadline: {grant_json.get('deadline', 'Not specified')}
+    """
+
+    return f"PROJECT: {project_details}\n\nGRANT DATA: {grant_context}\n\nPlease write the proposal draft."
+
+
+async def _start_run(prompt: str, run_config: Optional[RunConfig] = None):
+    """Create a fresh session and return the runner's event stream for prompt."""
+    session_service = InMemorySessionService()
+    
+    # Use unique session ID to avoid collision errors
+    session_id = f"writer-{uuid.uuid4().hex[:12]}"
+    
+    # We need to create the session before running
+    await session_service.create_session(
+        app_name="grant_writer_app",
+        user_id="writer_test_user",
+        session_id=session_id
+    )
+
+    runner = Runner(
+        agent=writer_agent,
+        app_name="grant_writer_app",
+        session_service=session_service
+    )
+
+    # Wrap the text in the correct Content object
+    user_msg = types.Content(role="user", parts=[types.Part(text=prompt)])
+
+    return runner.run_async(
+        user_id="writer_test_user",
+        session_id=session_id,
+        new_message=user_msg,
+        # Runner.run_async expects a RunConfig, so fall back to its own default
+        run_config=run_config if run_config is not None else RunConfig()
+    )
+
+
+# --- The Interface Functions ---
 def draft_proposal_section(project_details: str, grant_json: dict) -> str:
     """
     Formats inputs and runs the Writer Agent.
@@ -66,47 +116,14 @@ def draft_proposal_section(project_details: str, grant_json: dict) -> str:
     """
     
     # 1. Prepare the Prompt
-    grant_context = f"""
-    Target Grant: {grant_json.get('source', 'Unknown Funder')}
-    URL: {grant_json.get('url')}
-    Eligibility: {grant_json.get('eligibility', 'Not specified')}
-    Budget: {grant_json.get('budget', 'Not specified')}
-    Deadline: {grant_json.get('deadline', 'Not specified')}
-    """
-
-    prompt = f"PROJECT: {project_details}\n\nGRANT DATA: {grant_context}\n\nPlease write the proposal draft."
+    prompt = _build_prompt(project_details, grant_json)
 
     # 2. Run the Agent using ADK Runner
     # We use a helper function to run async code synchronously
     async def _run_agent():
-        session_service = InMemorySessionService()
-        
-        # Use unique session ID to avoid collision errors
-        session_id = f"writer-{uuid.uuid4().hex[:12]}"
-        
-        # We need to create the session before running
-        await session_service.create_session(
-            app_name="grant_writer_app",
-            user_id="writer_test_user",
-            session_id=session_id
-        )
-
-        runner = Runner(
-            agent=writer_agent,
-            app_name="grant_writer_app",
-            session_service=session_service
-        )
-
-        # Wrap the text in the correct Content object
-        user_msg = types.Content(role="user", parts=[types.Part(text=prompt)])
-
         # Await the run_async stream to get the final result
         final_text = ""
-        async for event in runner.run_async(
-            user_id="writer_test_user",
-            session_id=session_id,
-            new_message=user_msg
-        ):
+        async for event in await _start_run(prompt):
             if event.is_final_response() and event.content and event.content.parts:
                 final_text = event.content.parts[0].text
         
@@ -114,6 +131,53 @@ def draft_proposal_section(project_details: str, grant_json: dict) -> str:
 
     return asyncio.run(_run_agent())
 
+
+def draft_proposal_section_stream(project_details: str, grant_json: dict):
+    """
+    Streaming variant of draft_proposal_section: yields the draft in text chunks.
+    
+    The agent runs with SSE streaming in its own event loop on a helper thread,
+    which hands chunks over through a queue, so callers can simply iterate
+    (e.g. from a worker thread) and show partial text while generation continues.
+    Joining every yielded chunk gives the full draft.
+    """
+    prompt = _build_prompt(project_details, grant_json)
+    chunks = queue.Queue()
+    done = object()
+
+    async def _run_agent():
+        streamed = False
+        async for event in await _start_run(prompt, RunConfig(streaming_mode=StreamingMode.SSE)):
+            if not (event.content and event.content.parts):
+                continue
+            text = event.content.parts[0].text
+            if not text:
+                continue
+            if event.partial:
+                streamed = True
+                chunks.put(text)
+            elif event.is_final_response() and not streamed:
+                # Model/back end didn't stream: the final response is the whole draft
+                chunks.put(text)
+
+    def _produce():
+        try:
+            asyncio.run(_run_agent())
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(done)
+
+    threading.Thread(target=_produce, name="writer-agent-stream", daemon=True).start()
+
+    while True:
+        item = chunks.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
 # --- Test Block ---
 if __name__ == "__main__":
     mock_grant = {
@@ -1,22 +1,92 @@
 """
 Grant Details Page - Show full metadata and extracted eligibility/requirements
 """
+import hashlib
 import streamlit as st
 import sys
 import os
+from types import MappingProxyType
 
-# Add backend to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Add backend to path for imports (once: Streamlit re-executes this page on every rerun)
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
 from pdf_generator import generate_grant_pdf
 
 # Page configuration handled in home_page.py
 
-# Custom CSS
-st.markdown("""
+# Sample extracted insights (simulating AI analysis)
+# These will be populated from API data when available.
+# Read-only, so every rerun can share them by reference.
+DEFAULT_INSIGHTS = MappingProxyType({
+    "eligibility_checklist": (
+        MappingProxyType({"item": "501(c)(3) Non-profit status", "met": True, "confidence": "high"}),
+        MappingProxyType({"item": "Operational for at least 2 years", "met": True, "confidence": "high"}),
+        MappingProxyType({"item": "Annual budget under $1M", "met": None, "confidence": "medium"}),
+        MappingProxyType({"item": "Located in eligible geographic area", "met": True, "confidence": "high"}),
+        MappingProxyType({"item": "Previous grant recipient status", "met": None, "confidence": "low"})
+    ),
+    "required_documents": (
+        "Letter of Determination (501(c)(3))",
+        "Current year operating budget",
+        "Most recent audited financial statements",
+        "Board of Directors list",
+        "Project budget and narrative",
+        "Two letters of support from community partners"
+    ),
+    "key_dates": (
+        MappingProxyType({"event": "Application opens", "date": "2025-01-15"}),
+        MappingProxyType({"event": "Letter of Intent due", "date": "2025-02-01"}),
+        MappingProxyType({"event": "Full application deadline", "date": "2025-03-15"}),
+        MappingProxyType({"event": "Award notification", "date": "2025-05-01"}),
+        MappingProxyType({"event": "Grant period begins", "date": "2025-06-01"})
+    ),
+    "fit_score": 85,
+    "risk_factors": (
+        "Competitive grant with ~15% acceptance rate",
+        "Requires detailed evaluation plan",
+        "Matching funds may be required"
+    )
+})
+
+# Fallbacks for optional grant fields the page reads
+GRANT_FIELD_DEFAULTS = MappingProxyType({
+    "fit_score": 0,
+    "application_requirements": DEFAULT_INSIGHTS["required_documents"],
+    "funding_nature": "Unknown",
+    "geography": "Not specified",
+    "founder_demographics": (),
+})
+
+# Shown in place of an empty tag list (kept out of the grant dict itself)
+NO_TAGS = ("No tags available",)
+
+# Static "Extracted Requirements Summary" block for the Requirements tab
+REQUIREMENTS_SUMMARY_HTML = """
+### Extracted Requirements Summary
+
+<div class="insight-card" style="color: #2d3748;">
+    <strong>Application Process:</strong><br>
+    1. Submit Letter of Intent by deadline<br>
+    2. Receive invitation to submit full proposal<br>
+    3. Complete online application form<br>
+    4. Upload required documents<br>
+    5. Submit project budget and narrative
+</div>
+"""
+
+# Pages reachable from this one
+SEARCH_PAGE = "frontend/search_grants.py"
+PROPOSAL_BUILDER_PAGE = "frontend/proposal_builder.py"
+
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Return the page's static CSS block, built once and served from cache."""
+    return """
     <style>
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        .stDeployButton {display: none;}
+        /* #MainMenu, footer and .stDeployButton are hidden by home_page.py,
+           which emits its CSS on every run of every page */
         
         .detail-header {
             background-color: #eef6ff;
@@ -112,41 +182,79 @@ st.markdown("""
             background-color: #fed7d7;
             color: #c53030;
         }
+        
+        .tag-chip, .demo-chip {
+            display: inline-block;
+            padding: 0.25rem 0.75rem;
+            border-radius: 9999px;
+            font-size: 0.85rem;
+            margin-right: 0.5rem;
+        }
+        
+        .tag-chip {
+            background-color: #eef6ff;
+            color: #3182ce;
+        }
+        
+        .demo-chip {
+            background-color: #FED7E2;
+            color: #702459;
+        }
     </style>
-""", unsafe_allow_html=True)
+"""
 
-# Sample extracted insights (simulating AI analysis)
-# These will be populated from API data when available
-DEFAULT_INSIGHTS = {
-    "eligibility_checklist": [
-        {"item": "501(c)(3) Non-profit status", "met": True, "confidence": "high"},
-        {"item": "Operational for at least 2 years", "met": True, "confidence": "high"},
-        {"item": "Annual budget under $1M", "met": None, "confidence": "medium"},
-        {"item": "Located in eligible geographic area", "met": True, "confidence": "high"},
-        {"item": "Previous grant recipient status", "met": None, "confidence": "low"}
-    ],
-    "required_documents": [
-        "Letter of Determination (501(c)(3))",
-        "Current year operating budget",
-        "Most recent audited financial statements",
-        "Board of Directors list",
-        "Project budget and narrative",
-        "Two letters of support from community partners"
-    ],
-    "key_dates": [
-        {"event": "Application opens", "date": "2025-01-15"},
-        {"event": "Letter of Intent due", "date": "2025-02-01"},
-        {"event": "Full application deadline", "date": "2025-03-15"},
-        {"event": "Award notification", "date": "2025-05-01"},
-        {"event": "Grant period begins", "date": "2025-06-01"}
-    ],
-    "fit_score": 85,
-    "risk_factors": [
-        "Competitive grant with ~15% acceptance rate",
-        "Requires detailed evaluation plan",
-        "Matching funds may be required"
-    ]
-}
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _render_header_html(grant_id, title, funder, deadline, amount, funding_nature, geography) -> str:
+    """
+    Build the grant header card.
+    
+    Keyed on the grant id plus the handful of small strings it displays, so
+    reruns and return visits to the same grant are a cache hit instead of a
+    rebuilt f-string.
+    """
+    return f"""
+    <div class="detail-header">
+        <div class="detail-title">{title}</div>
+        <div class="detail-funder">🏛️ {funder}</div>
+        <div class="detail-meta">
+            <div class="meta-item">
+                <div class="meta-label">Deadline</div>
+                <div class="meta-value">📅 {deadline}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Amount</div>
+                <div class="meta-value">💰 {amount}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Funding Type</div>
+                <div class="meta-value">📝 {funding_nature}</div>
+            </div>
+            <div class="meta-item">
+                <div class="meta-label">Location</div>
+                <div class="meta-value">🌍 {geography}</div>
+            </div>
+        </div>
+    </div>
+"""
+
+
+def _render_page_shell(grant, funding_nature, geography):
+    """
+    Build the page CSS and the grant header as one HTML string.
+    
+    Emitting both through a single st.markdown call means one markdown parse
+    per rerun instead of one per block.
+    """
+    return _css() + _render_header_html(
+        grant.get('id'),
+        grant['title'],
+        grant['funder'],
+        grant['deadline'],
+        grant['amount'],
+        funding_nature,
+        geography,
+    )
 
 
 def get_confidence_badge(confidence):
@@ -160,7 +268,8 @@ def get_confidence_badge(confidence):
 
 
 def render_eligibility_checklist(items):
-    """Render the eligibility checklist."""
+    """Render the eligibility checklist as a single markdown block."""
+    rows = []
     for item in items:
         status = item.get("met")
         if status is True:
@@ -173,13 +282,47 @@ def render_eligibility_checklist(items):
             icon = "❓"
             status_class = ""
         
-        st.markdown(f"""
+        rows.append(f"""
             <div class="checklist-item">
                 <span class="{status_class}">{icon}</span>
                 <span>{item['item']}</span>
                 <span style="margin-left: auto;">{get_confidence_badge(item['confidence'])}</span>
-            </div>
-        """, unsafe_allow_html=True)
+            </div>""")
+    
+    st.markdown("".join(rows), unsafe_allow_html=True)
+
+
+def _grant_key(grant) -> str:
+    """
+    Stable widget-key suffix for a grant.
+    
+    Grant ids are positions in one search's results, so the same id points
+    at a different grant after the next search; the URL and title don't.
+    """
+    identity = f"{grant.get('url', '')}\n{grant.get('title', '')}"
+    return hashlib.blake2b(identity.encode(), digest_size=8).hexdigest()
+
+
+@st.fragment
+def render_requirements_checklist(requirements, grant_key):
+    """
+    Render the application requirements as a single tickable table.
+    
+    One data_editor widget replaces a checkbox per document, and the key is
+    scoped to the grant so ticks don't carry over to the next grant opened.
+    Runs as a fragment: ticking a box reruns only this checklist, not the
+    whole page (header, tabs, sidebar and the PDF export).
+    """
+    st.data_editor(
+        {"Requirement": list(requirements), "Done": [False] * len(requirements)},
+        key=f"reqs_table_{grant_key}",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Requirement": st.column_config.TextColumn("Requirement", disabled=True),
+            "Done": st.column_config.CheckboxColumn("Done"),
+        },
+    )
 
 
 def main():
@@ -194,54 +337,32 @@ def main():
         st.warning("No grant selected. Please go back to the search page and select a grant.")
         if st.button("🔙 Back to Search Grants"):
             st.session_state.selected_grant = {}
-            st.switch_page("frontend/search_grants.py")
+            st.switch_page(SEARCH_PAGE)
         st.stop()
     
     # If no tags are found for the selected grant, we display "No tags available"
-    if not grant.get('tags'):
-        grant['tags'] = ["No tags available"]
+    tags = grant.get('tags') or NO_TAGS
 
-    # Get insights from grant data (API format) or fall back to defaults
-    fit_score = grant.get('fit_score', 0)
-    application_requirements = grant.get('application_requirements', DEFAULT_INSIGHTS['required_documents'])
+    # Get insights from grant data (API format) or fall back to defaults,
+    # merging once instead of probing the grant field by field
+    fields = {**GRANT_FIELD_DEFAULTS, **grant}
+    fit_score = fields['fit_score']
+    application_requirements = fields['application_requirements']
     # New fields from backend
-    funding_nature = grant.get('funding_nature', 'Unknown')
-    geography = grant.get('geography', 'Not specified')
-    founder_demographics = grant.get('founder_demographics', [])
+    funding_nature = fields['funding_nature']
+    geography = fields['geography']
+    founder_demographics = fields['founder_demographics']
     
-    # Header Section
-    st.markdown(f"""
-        <div class="detail-header">
-            <div class="detail-title">{grant['title']}</div>
-            <div class="detail-funder">🏛️ {grant['funder']}</div>
-            <div class="detail-meta">
-                <div class="meta-item">
-                    <div class="meta-label">Deadline</div>
-                    <div class="meta-value">📅 {grant['deadline']}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Amount</div>
-                    <div class="meta-value">💰 {grant['amount']}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Funding Type</div>
-                    <div class="meta-value">📝 {funding_nature}</div>
-                </div>
-                <div class="meta-item">
-                    <div class="meta-label">Location</div>
-                    <div class="meta-value">🌍 {geography}</div>
-                </div>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    # Page CSS + header section in a single markdown call
+    st.markdown(_render_page_shell(grant, funding_nature, geography), unsafe_allow_html=True)
     
     # Action buttons row
     btn_col1, btn_col2, btn_col3 = st.columns(3)
     
     with btn_col1:
         if st.button("✍️ Generate Proposal", type="primary", use_container_width=True):
-            st.session_state.selected_grant = grant
-            st.switch_page("frontend/proposal_builder.py")
+            # grant was read from session_state.selected_grant, so it is already there
+            st.switch_page(PROPOSAL_BUILDER_PAGE)
     
     with btn_col2:
         pdf_data = generate_grant_pdf(grant)
@@ -274,24 +395,23 @@ def main():
     ])
     
     with tab1:
-        st.markdown("### Grant Overview")
         # Use detailed_overview if available, otherwise use description
         overview_text = grant.get('detailed_overview', grant.get('description', 'No description available'))
-        st.markdown(f"""
-            <div class="insight-card" style="color: #2d3748;">
-                <p>{overview_text}</p>
-            </div>
-        """, unsafe_allow_html=True)
+        overview_parts = [
+            "### Grant Overview",
+            f'<div class="insight-card" style="color: #2d3748;"><p>{overview_text}</p></div>',
+        ]
         
         # Display founder demographics if available
         if founder_demographics:
-            st.markdown("### Target Demographics")
-            demographics_html = " ".join([f'<span style="background-color: #FED7E2; color: #702459; padding: 0.25rem 0.75rem; border-radius: 9999px; font-size: 0.85rem; margin-right: 0.5rem;">{demo}</span>' for demo in founder_demographics])
-            st.markdown(demographics_html, unsafe_allow_html=True)
+            overview_parts.append("### Target Demographics")
+            overview_parts.append("".join(f'<span class="demo-chip">{demo}</span>' for demo in founder_demographics))
+        
+        overview_parts.append("### Tags")
+        overview_parts.append("".join(f'<span class="tag-chip">{tag}</span>' for tag in tags))
         
-        st.markdown("### Tags")
-        tags_html = " ".join([f'<span style="background-color: #eef6ff; color: #3182ce; padding: 0.25rem 0.75rem; border-radius: 9999px; font-size: 0.85rem; margin-right: 0.5rem;">{tag}</span>' for tag in grant['tags']])
-        st.markdown(tags_html, unsafe_allow_html=True)
+        # One markdown call for the whole tab instead of one per block
+        st.markdown("\n\n".join(overview_parts), unsafe_allow_html=True)
         
     
     with tab2:
@@ -301,37 +421,26 @@ def main():
         
         # Use eligibility_checklist from grant data (API format)
         # render_eligibility_checklist(eligibility_checklist)
-        st.markdown("### Eligibility Criteria")
-        # st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("#### Source Text")
         st.markdown(f"""
-            <div class="insight-card" style="color: #2d3748;">
-                <strong>Extracted from grant page:</strong><br>
-                "{grant.get('eligibility', 'Eligibility information extracted from the grant webpage.')}"
-            </div>
-        """, unsafe_allow_html=True)
+### Eligibility Criteria
+
+#### Source Text
+
+<div class="insight-card" style="color: #2d3748;">
+    <strong>Extracted from grant page:</strong><br>
+    "{grant.get('eligibility', 'Eligibility information extracted from the grant webpage.')}"
+</div>
+""", unsafe_allow_html=True)
         
         
     
     with tab3:
-        st.markdown("### Application Requirements")
-        st.markdown("*Documents and materials needed for your application*")
+        st.markdown("### Application Requirements\n\n*Documents and materials needed for your application*")
         
         # Use application_requirements from grant data (API format)
-        for i, doc in enumerate(application_requirements, 1):
-            st.checkbox(doc, key=f"req_{i}")
+        render_requirements_checklist(application_requirements, _grant_key(grant))
         
-        st.markdown("### Extracted Requirements Summary")
-        st.markdown("""
-            <div class="insight-card" style="color: #2d3748;">
-                <strong>Application Process:</strong><br>
-                1. Submit Letter of Intent by deadline<br>
-                2. Receive invitation to submit full proposal<br>
-                3. Complete online application form<br>
-                4. Upload required documents<br>
-                5. Submit project budget and narrative
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(REQUIREMENTS_SUMMARY_HTML, unsafe_allow_html=True)
     
     
     # Sidebar
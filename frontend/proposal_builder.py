@@ -1,26 +1,67 @@
 """
 Proposal Builder Page - Simple AI-assisted grant proposal generation
 """
-import asyncio
 import importlib
 import streamlit as st
 from st_copy import copy_button
 import sys
 import os
 import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# Add backend to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Backend directory, added to sys.path by _get_writer_module() on first use
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+# Set DEV_RELOAD=1 to re-import writer_agent on every generation while developing it
+DEV_RELOAD = os.getenv("DEV_RELOAD", "").lower() in ("1", "true", "yes")
+
+# Writer agent calls running at once across ALL sessions of this server process;
+# further Generate clicks queue until a worker frees up. Raise it (e.g.
+# WRITER_AGENT_WORKERS=16) for deployments serving many concurrent users.
+WRITER_AGENT_WORKERS = max(1, int(os.getenv("WRITER_AGENT_WORKERS", "4")))
 
 # Page configuration handled in home_page.py
 
 
-# Custom CSS
-st.markdown("""
+USER_DRAFT_KEY = 'user_draft_text'
+# Widget key for the description box. Streamlit drops widget keys when the user
+# leaves the page, so 'project_description' keeps the persistent copy.
+PROJECT_DESCRIPTION_KEY = 'project_description_input'
+# UTF-8 encoding of the user draft for the download button, refreshed only when the draft changes
+USER_DRAFT_BYTES_KEY = 'user_draft_bytes'
+
+# Initialize session state
+SESSION_DEFAULTS = {
+    'agent_draft': '',
+    'project_description': '',
+    USER_DRAFT_KEY: '',
+    USER_DRAFT_BYTES_KEY: b'',
+}
+
+for key, default in SESSION_DEFAULTS.items():
+    # Always index by the key's value: st.session_state[USER_DRAFT_KEY], never a rebinding
+    st.session_state.setdefault(key, default)
+
+# User draft editor sizing. The empty editor is just tall enough for its
+# placeholder; this only depends on constants, so it is worked out at import.
+_PLACEHOLDER_TEXT = "Start writing your proposal here, or copy the AI-generated draft and customize it..."
+# Estimate height to fit placeholder: approximate chars per line, line height and padding
+_CHARS_PER_LINE = 70
+_LINE_HEIGHT = 22
+_PADDING = 24
+_LINES = sum(math.ceil(len(line) / _CHARS_PER_LINE) for line in _PLACEHOLDER_TEXT.split("\n"))
+_MIN_HEIGHT = max(40, int(_LINES * _LINE_HEIGHT + _PADDING))
+_DRAFT_HEIGHT = 610
+
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Return the page's static CSS block, built once and served from cache."""
+    return """
     <style>
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        .stDeployButton {display: none;}
+        /* #MainMenu, footer and .stDeployButton are hidden by home_page.py,
+           which emits its CSS on every run of every page */
         
         .builder-header {
             background-color: #eef6ff;
@@ -28,68 +69,144 @@ st.markdown("""
             padding: 1.5rem;
             margin-bottom: 1.5rem;
         }
-        
-        .draft-section {
-            background-color: #f7fafc;
-            border: 1px solid #e2e8f0;
-            border-radius: 8px;
-            padding: 1.5rem;
-            margin: 1rem 0;
-        }
-        
-        .agent-response {
-            background-color: #f0fff4;
-            border-left: 4px solid #38a169;
-            color: #2d3748;
-            padding: 1rem 1.5rem;
-            margin: 1rem 0;
-            border-radius: 0 8px 8px 0;
-            max-height: 580px;
-            overflow-y: auto;
-        }
-        
-        .user-draft {
-            background-color: #ebf8ff;
-            border-left: 4px solid #3182ce;
-            padding: 1rem 1.5rem;
-            margin: 1rem 0;
-            border-radius: 0 8px 8px 0;
-        }
     </style>
-""", unsafe_allow_html=True)
+"""
 
-# Initialize session state
-if 'agent_draft' not in st.session_state:
-    st.session_state.agent_draft = ''
 
-if 'user_draft' not in st.session_state:
-    st.session_state.user_draft = ''
+@st.cache_data(show_spinner=False, max_entries=128)
+def _header_html(title: str, funder: str, deadline: str, amount: str) -> str:
+    """Build the builder header card, cached per grant."""
+    return f"""
+    <div class="builder-header" style="color: #2d3748;">
+        <h2>✍️ Proposal Builder</h2>
+        <p style="color: #4a5568;">Building proposal for: <strong>{title}</strong></p>
+        <p style="color: #718096; font-size: 0.9rem;">🏛️ {funder} | 📅 Deadline: {deadline} | 💰 {amount}</p>
+    </div>
+"""
 
-if 'project_description' not in st.session_state:
-    st.session_state.project_description = ''
 
-USER_DRAFT_KEY = 'user_draft_text'
-if USER_DRAFT_KEY not in st.session_state:
-    st.session_state[USER_DRAFT_KEY] = ''
+def _render_page_shell(grant: dict) -> str:
+    """
+    Build the page CSS and the builder header as one HTML string.
+    
+    Emitting both through a single st.markdown call means one markdown parse
+    per rerun instead of one per block.
+    """
+    return _css() + _header_html(
+        grant.get('title', 'New Proposal'),
+        grant.get('funder', 'Unknown Funder'),
+        grant.get('deadline', 'TBD'),
+        grant.get('amount', 'Amount TBD'),
+    )
+
+@st.cache_resource(show_spinner=False)
+def _get_writer_module():
+    """
+    Import the writer_agent module once per server process.
+    
+    Importing it pulls in the ADK/GenAI SDKs, so the module object is cached
+    and every later generation reuses it.
+    """
+    if BACKEND_PATH not in sys.path:
+        sys.path.insert(0, BACKEND_PATH)
+    return importlib.import_module("writer_agent")
+
+
+@st.cache_resource(show_spinner=False)
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Worker pool that runs writer agent calls off the Streamlit script thread.
+    
+    It is shared process-wide, so WRITER_AGENT_WORKERS caps the generations
+    running at once for every user combined; later jobs wait in its queue.
+    """
+    return ThreadPoolExecutor(max_workers=WRITER_AGENT_WORKERS, thread_name_prefix="writer-agent")
+
+
+@st.cache_resource(show_spinner=False)
+def _prewarm_writer_module() -> Future:
+    """
+    Start importing writer_agent in the background, once per server process.
+    
+    The first import pulls in the ADK/GenAI SDKs and builds the agent, which
+    would otherwise land on the first Generate click. Running it on the worker
+    pool while the user is still typing hides that cost; _get_writer_module()
+    then finds the module already in sys.modules. Import errors (e.g. a missing
+    API key) are left in the Future and resurface on the real import.
+    """
+    if BACKEND_PATH not in sys.path:
+        sys.path.insert(0, BACKEND_PATH)
+    return _get_executor().submit(importlib.import_module, "writer_agent")
+
 
-# Import the writer_agent module
+# Generated drafts are reused for identical (description, grant) inputs for an hour
+DRAFT_CACHE_TTL = 3600
+DRAFT_CACHE_MAX_ENTRIES = 128
 
-def generate_proposal_with_agent(project_description: str, grant: dict) -> str:
+
+@st.cache_resource(show_spinner=False)
+def _get_draft_cache() -> dict:
+    """
+    Process-wide memo of writer agent calls:
+    (description, grant fields) -> (started_at, Future, streamed chunks).
+    
+    Storing the Future (rather than the finished text) means a repeat click
+    while the first call is still running joins it instead of starting another.
     """
-    Call the writer_agent to generate a proposal draft.
+    return {}
+
+
+def _cached_draft(cache: dict, key: tuple):
+    """Return the memoised (Future, chunks) for key, or None if missing, expired or failed."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    started_at, future, chunks = entry
+    if time.monotonic() - started_at > DRAFT_CACHE_TTL:
+        return None
+    if future.done() and (future.cancelled() or future.exception() is not None or not future.result()):
+        return None
+    return future, chunks
+
+
+def _remember_draft(cache: dict, key: tuple, future: Future, chunks: list) -> None:
+    """Store future and its chunks under key, dropping expired entries and then the oldest beyond the cap."""
+    now = time.monotonic()
+    for stale_key in [k for k, (started_at, _, _) in cache.items() if now - started_at > DRAFT_CACHE_TTL]:
+        cache.pop(stale_key, None)
+    cache.pop(key, None)
+    cache[key] = (now, future, chunks)
+    while len(cache) > DRAFT_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)), None)
+
+
+def _stream_draft(writer_module, project_description: str, grant_json: dict, chunks: list) -> str:
+    """Worker body: append streamed text to chunks as it arrives and return the full draft."""
+    for chunk in writer_module.draft_proposal_section_stream(project_description, grant_json):
+        chunks.append(chunk)
+    return "".join(chunks)
+
+
+def generate_proposal_with_agent(project_description: str, grant: dict) -> tuple[Future, list]:
+    """
+    Start the writer_agent generating a proposal draft in the background.
+    
+    The LLM call can take a while, so it runs on a worker thread instead of
+    blocking this session's script run; poll_agent_draft() shows the text
+    streamed so far and collects the result.
     
     Args:
         project_description: Description of the project
         grant: Grant details dictionary
     
     Returns:
-        Generated proposal text from the AI agent
+        (Future resolving to the generated proposal text from the AI agent,
+         list the worker appends streamed text chunks to)
     """
-    # Force reimport to get fresh module state
-    if "writer_agent" in sys.modules:
-        del sys.modules["writer_agent"]
-    
-    writer_module = importlib.import_module("writer_agent")
+    # Resolve the module here, on the script thread, where Streamlit's caches work
+    writer_module = _get_writer_module()
+    if DEV_RELOAD:
+        writer_module = importlib.reload(writer_module)
     
     # Map grant data to the format expected by writer_agent
     grant_json = {
@@ -100,11 +217,144 @@ def generate_proposal_with_agent(project_description: str, grant: dict) -> str:
         "deadline": grant.get("deadline", "Not specified"),
     }
     
-    # Call the writer agent directly - it handles its own async loop
+    # Same description for the same grant: reuse the earlier (or in-flight) draft
+    # instead of paying for another LLM call
+    cache_key = (project_description, tuple(grant_json.values()))
+    cache = _get_draft_cache()
+    cached = None if DEV_RELOAD else _cached_draft(cache, cache_key)
+    if cached is not None:
+        return cached
+    
+    # The writer agent handles its own async loop, so it can run as-is on a worker
     # This is where the frontend hands off control to the backend AI agent.
-    result = writer_module.draft_proposal_section(project_description, grant_json)
+    chunks = []
+    future = _get_executor().submit(_stream_draft, writer_module, project_description, grant_json, chunks)
+    _remember_draft(cache, cache_key, future, chunks)
+    return future, chunks
+
+
+@st.fragment(run_every=0.5)
+def poll_agent_draft():
+    """
+    Show the streamed text of a pending draft and collect it once it finishes.
+    
+    Reruns on its own every half second (only this fragment, not the page),
+    so partial text is flushed to the screen in batches rather than per token.
+    Only call it while a draft is pending: the timer runs for as long as the
+    fragment is rendered. When the future resolves it stores the draft, or
+    the error, and triggers one full rerun, which drops the fragment.
     
-    return result
+    While every writer worker is busy with other generations the draft is
+    still queued, and the fragment says so instead of showing it as running.
+    """
+    future = st.session_state.get('draft_future')
+    if future is None:
+        return
+    
+    if not future.done():
+        partial = "".join(st.session_state.get('draft_chunks', ()))
+        if partial:
+            st.caption("🤖 AI Agent is writing...")
+            with st.container(border=True, height=580):
+                st.markdown(partial)
+        elif not future.running():
+            st.info("⏳ Your draft is queued: the AI Agent is busy with other proposals and will start it shortly.")
+        else:
+            st.info("🤖 AI Agent is generating your proposal draft... This may take a moment.")
+        if st.button("✖️ Cancel", use_container_width=True):
+            # A call that has already started can't be interrupted, and the future
+            # may be shared with other sessions through the draft cache, so just
+            # stop waiting for it here.
+            del st.session_state.draft_future
+            st.session_state.pop('draft_chunks', None)
+            st.rerun()
+        return
+    
+    del st.session_state.draft_future
+    st.session_state.pop('draft_chunks', None)
+    try:
+        draft = future.result()
+    except Exception as e:
+        st.session_state.draft_error = e
+    else:
+        if draft:
+            st.session_state.agent_draft = draft
+            set_user_draft(draft)  # Auto-copy to user draft
+        else:
+            st.session_state.draft_error = None
+    st.rerun()
+
+
+def set_user_draft(text: str):
+    """Replace the user draft (must run before the editor is built in a run)."""
+    st.session_state[USER_DRAFT_KEY] = text
+    encode_user_draft()
+
+
+def encode_user_draft():
+    """on_change callback for the draft editor: re-encode the download payload once per edit."""
+    st.session_state[USER_DRAFT_BYTES_KEY] = st.session_state[USER_DRAFT_KEY].encode("utf-8")
+
+
+def save_project_description():
+    """on_click callback for Generate: copy the submitted description to its persistent key."""
+    st.session_state.project_description = st.session_state[PROJECT_DESCRIPTION_KEY]
+
+
+def copy_agent_draft():
+    """Callback for "Copy to My Draft": overwrite the user draft with the agent's."""
+    set_user_draft(st.session_state.agent_draft)
+
+
+@st.fragment
+def render_user_draft():
+    """
+    Render the user's draft editor with its download and copy actions.
+    
+    Runs as a fragment, so committing an edit or clicking Download reruns only
+    this column instead of the whole page.
+    """
+    st.markdown("### 📝 Your Draft")
+    st.markdown("*Edit and finalize your proposal*")
+    
+    # Editable text area for user's draft
+    _height = _MIN_HEIGHT if not st.session_state[USER_DRAFT_KEY].strip() else _DRAFT_HEIGHT
+
+    # Bound by key: st.session_state[USER_DRAFT_KEY] is the single copy of the draft
+    st.text_area(
+        "Your Proposal Draft",
+        key=USER_DRAFT_KEY,
+        height=_height,
+        placeholder=_PLACEHOLDER_TEXT,
+        label_visibility="collapsed",
+        on_change=encode_user_draft
+    )
+    
+    # Action buttons
+    # btn_col1, btn_col2 = st.columns(2)
+    
+    # with btn_col1:
+    #     if st.button("💾 Copy Draft", use_container_width=True):
+    #         if st.session_state[USER_DRAFT_KEY]:
+    #             st.success("Draft copied!")
+    #         else:
+    #             st.warning("Nothing to save yet.")
+
+    
+    # with btn_col1:
+    if st.session_state[USER_DRAFT_KEY]:
+        if st.download_button(
+            label="Download",
+            data=st.session_state[USER_DRAFT_BYTES_KEY],
+            file_name="draft.txt",
+            mime="text/plain",
+        ):
+            st.success("File Downloaded!")
+        copy_button(st.session_state[USER_DRAFT_KEY],key="copy_draft_btn")
+    else:
+        st.warning("Nothing to download yet.")
+        st.warning("Nothing to copy yet.")
+    # with btn_col2:
 
 
 def main():
@@ -118,30 +368,51 @@ def main():
             st.switch_page("frontend/search_grants.py")
         st.stop()
     
-    # Header
-    st.markdown(f"""
-        <div class="builder-header" style="color: #2d3748;">
-            <h2>✍️ Proposal Builder</h2>
-            <p style="color: #4a5568;">Building proposal for: <strong>{grant.get('title', 'New Proposal')}</strong></p>
-            <p style="color: #718096; font-size: 0.9rem;">🏛️ {grant.get('funder', 'Unknown Funder')} | 📅 Deadline: {grant.get('deadline', 'TBD')} | 💰 {grant.get('amount', 'Amount TBD')}</p>
-        </div>
-    """, unsafe_allow_html=True)
+    # Page CSS + header in a single markdown call
+    st.markdown(_render_page_shell(grant), unsafe_allow_html=True)
+    
+    # Warm up the writer agent import while the user fills in the description
+    _prewarm_writer_module()
     
     # Project Description Input Section
     st.markdown("### 📝 Describe Your Project")
     st.markdown("*Provide details about your project so the AI can generate a tailored proposal*")
     
-    project_description = st.text_area(
-        "Project Description",
-        value=st.session_state.project_description,
-        height=50,
-        placeholder="Describe your project in detail. For example: A community garden project in downtown Chicago aiming to provide fresh produce to low-income families and educational workshops for youth. We plan to transform 3 vacant lots into productive gardens serving 500+ residents...",
-        label_visibility="collapsed"
-    )
+    # Description + Generate live in one form, so typing doesn't rerun the page;
+    # the only rerun is the submit itself.
+    if PROJECT_DESCRIPTION_KEY not in st.session_state:
+        # First visit, or back from another page: re-seed the box from the saved copy
+        st.session_state[PROJECT_DESCRIPTION_KEY] = st.session_state.project_description
+    with st.form("proposal_form", clear_on_submit=False, border=False):
+        st.text_area(
+            "Project Description",
+            key=PROJECT_DESCRIPTION_KEY,
+            height=50,
+            placeholder="Describe your project in detail. For example: A community garden project in downtown Chicago aiming to provide fresh produce to low-income families and educational workshops for youth. We plan to transform 3 vacant lots into productive gardens serving 500+ residents...",
+            label_visibility="collapsed"
+        )
+        
+        # Button to generate/regenerate agent draft (disabled while one is pending)
+        generate_clicked = st.form_submit_button(
+            "✨ Generate Draft",
+            type="primary",
+            use_container_width=True,
+            disabled='draft_future' in st.session_state,
+            on_click=save_project_description
+        )
     
-    # Update session state
-    if project_description != st.session_state.project_description:
-        st.session_state.project_description = project_description
+    if generate_clicked:
+        if not st.session_state.project_description.strip():
+            st.warning("Please describe your project above before generating a draft.")
+        else:
+            try:
+                st.session_state.draft_future, st.session_state.draft_chunks = generate_proposal_with_agent(
+                    st.session_state.project_description,
+                    grant
+                )
+            except Exception as e:
+                # e.g. writer_agent failing to import without GEMINI_API_KEY
+                st.session_state.draft_error = e
     
     st.markdown("---")
     
@@ -153,102 +424,34 @@ def main():
         st.markdown("### 🤖 AI Agent Draft")
         st.markdown("*Generated proposal from the AI agent*")
         
-        # Button to generate/regenerate agent draft
-        if st.button("✨ Generate Draft", type="primary", use_container_width=True):
-            if not st.session_state.project_description.strip():
-                st.warning("Please describe your project above before generating a draft.")
+        # Progress / result collection for a background generation
+        if 'draft_future' in st.session_state:
+            poll_agent_draft()
+        
+        # Report a failed generation (set by poll_agent_draft)
+        if 'draft_error' in st.session_state:
+            error = st.session_state.pop('draft_error')
+            if error is None:
+                st.error("Failed to generate draft. Please try again.")
             else:
-                with st.spinner("AI Agent is generating your proposal draft... This may take a moment."):
-                    try:
-                        draft = generate_proposal_with_agent(
-                            st.session_state.project_description,
-                            grant
-                        )
-                        if draft:
-                            st.session_state.agent_draft = draft
-                            st.session_state[USER_DRAFT_KEY] = draft  # Auto-copy to user draft
-                            st.rerun()
-                        else:
-                            st.error("Failed to generate draft. Please try again.")
-                    except Exception as e:
-                        error_type = type(e).__name__
-                        st.error(f"❌ Error generating draft: {error_type}")
-                        st.error(f"Details: {str(e)[:200]}")
-                        st.info("👉 Tip: Try adding more detail to your project description or check if environment variables are set correctly.")
+                error_type = type(error).__name__
+                st.error(f"❌ Error generating draft: {error_type}")
+                st.error(f"Details: {str(error)[:200]}")
+                st.info("👉 Tip: Try adding more detail to your project description or check if environment variables are set correctly.")
         
         # Display agent draft
         if st.session_state.agent_draft:
-            st.markdown(f"""
-                <div class="agent-response">
-                    {(st.session_state.agent_draft.replace(chr(10), '<br>'))}
-                </div>
-            """, unsafe_allow_html=True)
-            # Copy to user draft button
-            if st.button("📋 Copy to My Draft", use_container_width=True):
-                # st.rerun()
-                st.session_state[USER_DRAFT_KEY] = st.session_state.agent_draft
+            # Scrollable bordered box; the draft is markdown, so no HTML conversion needed
+            with st.container(border=True, height=580):
+                st.markdown(st.session_state.agent_draft)
+            # Copy to user draft button (callback runs before the editor is rebuilt)
+            if st.button("📋 Copy to My Draft", use_container_width=True, on_click=copy_agent_draft):
                 st.success("Copied to your draft!")
             
         else:
             st.info("Click 'Generate Draft' to get an AI-generated proposal based on the grant requirements.")
     with col_user:
-        st.markdown("### 📝 Your Draft")
-        st.markdown("*Edit and finalize your proposal*")
-        
-        # Editable text area for user's draft
-        _placeholder_text = "Start writing your proposal here, or copy the AI-generated draft and customize it..."
-        # Estimate height to fit placeholder: approximate chars per line, line height and padding
-        _chars_per_line = 70
-        _line_height = 22
-        _padding = 24
-
-        _lines = sum(math.ceil(len(line) / _chars_per_line) for line in _placeholder_text.split("\n"))
-        _min_height = max(40, int(_lines * _line_height + _padding))
-
-        _height = _min_height if not st.session_state[USER_DRAFT_KEY].strip() else 610
-
-        user_draft = st.text_area(
-            "Your Proposal Draft",
-            key=USER_DRAFT_KEY,
-            height=_height,
-            placeholder=_placeholder_text,
-            label_visibility="collapsed"
-        )
-
-        # if user_draft != st.session_state.user_draft:
-        #     st.session_state.user_draft = user_draft
-        
-        # Update session state
-        if user_draft != st.session_state.user_draft:
-            st.session_state.user_draft = user_draft
-        
-        # Action buttons
-        # btn_col1, btn_col2 = st.columns(2)
-        
-        # with btn_col1:
-        #     if st.button("💾 Copy Draft", use_container_width=True):
-        #         if st.session_state.user_draft:
-        #             st.success("Draft copied!")
-        #         else:
-        #             st.warning("Nothing to save yet.")
-
-        
-        # with btn_col1:
-        if st.session_state.user_draft:
-            if st.download_button(
-                label="Download",
-                data=st.session_state[USER_DRAFT_KEY],
-                file_name="draft.txt",
-                mime="text/plain",
-            ):
-                st.success("File Downloaded!")
-            copy_button(st.session_state[USER_DRAFT_KEY],key="copy_draft_btn")
-        else:
-            st.warning("Nothing to download yet.")
-            st.warning("Nothing to copy yet.")
-        # with btn_col2:
-        
-        
+        render_user_draft()
     
     # Quick tips in sidebar
     with st.sidebar:
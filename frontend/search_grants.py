@@ -10,8 +10,10 @@ import streamlit as st
 import sys
 import os
 
-# Add backend to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Add backend to path for imports (once: Streamlit re-executes this page on every rerun)
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
 from pdf_generator import generate_grant_pdf  # Used to generate PDF exports of grants
 
 # Page configuration handled in home_page.py
@@ -22,9 +24,8 @@ from pdf_generator import generate_grant_pdf  # Used to generate PDF exports of
 # Styling for the search interface including cards, filters, and empty states
 st.markdown("""
     <style>
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        .stDeployButton {display: none;}
+        /* #MainMenu, footer and .stDeployButton are hidden by home_page.py,
+           which emits its CSS on every run of every page */
         
         .search-header {
             text-align: center;
@@ -102,36 +103,86 @@ st.markdown("""
 # We use session_state to persist data between page re-runs.
 # This ensures that search results don't disappear when you interact with other widgets.
 
-# Core search session state
-if 'search_results' not in st.session_state:
-    st.session_state.search_results = []
-if 'search_query' not in st.session_state:
-    st.session_state.search_query = ""
-if 'has_searched' not in st.session_state:
-    st.session_state.has_searched = False
-if 'searching' not in st.session_state:
-    st.session_state.searching = False
-
-# Advanced filter session state - Canadian context filters
-if 'demographic_focus' not in st.session_state:
-    st.session_state.demographic_focus = []
-if 'funding_min' not in st.session_state:
-    st.session_state.funding_min = None
-if 'funding_max' not in st.session_state:
-    st.session_state.funding_max = None
-if 'funding_types' not in st.session_state:
-    st.session_state.funding_types = []
-if 'geographic_scope' not in st.session_state:
-    st.session_state.geographic_scope = ""
-if 'applicant_type' not in st.session_state:
-    st.session_state.applicant_type = ""
-if 'project_stage' not in st.session_state:
-    st.session_state.project_stage = ""
+SESSION_DEFAULTS = {
+    # Core search session state
+    'search_results': [],
+    'search_query': "",
+    'has_searched': False,
+    'searching': False,
+    'last_search_tokens': 0,
+    # Advanced filter session state - Canadian context filters
+    'demographic_focus': [],
+    'funding_min': None,
+    'funding_max': None,
+    'funding_types': [],
+    'geographic_scope': "",
+    'applicant_type': "",
+    'project_stage': "",
+}
+
+for key, default in SESSION_DEFAULTS.items():
+    # Copy list defaults so sessions never share (and mutate) the same object
+    st.session_state.setdefault(key, default.copy() if isinstance(default, list) else default)
 
 
 # Deprecated: previously used for file-based persistence
 GRANTS_FILE_PATH = None
 
+# Page opened by a result card's "View Details" button
+GRANT_DETAILS_PAGE = "frontend/grant_details.py"
+
+# Set DEV_RELOAD=1 to re-import the backend on every search while developing it
+DEV_RELOAD = os.getenv("DEV_RELOAD", "").lower() in ("1", "true", "yes")
+
+# Advanced filter choices. Built once at import instead of on every rerun.
+DEMOGRAPHIC_OPTIONS = (
+    "Women-led / Female Founders",
+    "Indigenous-led (First Nations, Inuit, Métis)",
+    "Black-led",
+    "BIPOC (General)",
+    "Youth-led (Under 30)",
+    "Newcomers to Canada"
+)
+FUNDING_TYPE_OPTIONS = (
+    "Non-repayable Grant",
+    "Repayable Loan / Contribution",
+    "Tax Credit",
+    # "Wage Subsidy (Hiring grants)",
+    # "In-Kind (Services/Equipment)"
+)
+GEOGRAPHIC_OPTIONS = (
+    "",
+    "National (Federal Canada-wide)",
+    "Alberta",
+    "British Columbia",
+    "Manitoba",
+    "New Brunswick",
+    "Newfoundland and Labrador",
+    "Northwest Territories",
+    "Nova Scotia",
+    "Nunavut",
+    "Ontario",
+    "Prince Edward Island",
+    "Quebec",
+    "Saskatchewan",
+    "Yukon",
+    "Rural / Remote (Northern/Rural streams)"
+)
+APPLICANT_OPTIONS = (
+    "",
+    "Registered Non-profit / Charity",
+    "For-profit / Startup",
+    "Academic / Research Institution",
+    "Individual / Artist"
+)
+PROJECT_STAGE_OPTIONS = (
+    "",
+    "Early Stage / R&D",
+    "Commercialization / Scaling",
+    "Hiring / Training",
+    "Export / International Expansion"
+)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -154,6 +205,23 @@ def has_active_filters():
     )
 
 
+def count_active_filters():
+    """
+    Count the active advanced filters (the funding min/max range counts as one).
+    Returns 0 exactly when has_active_filters() is False, so callers that need
+    both the flag and the count can compute this once.
+    """
+    state = st.session_state
+    return (
+        bool(state.demographic_focus) +
+        (state.funding_min is not None or state.funding_max is not None) +
+        bool(state.funding_types) +
+        bool(state.geographic_scope) +
+        bool(state.applicant_type) +
+        bool(state.project_stage)
+    )
+
+
 def clear_all_filters():
     """
     Callback function to reset all filter selections to default values.
@@ -169,6 +237,30 @@ def clear_all_filters():
     st.session_state.project_stage = None
 
 
+def open_grant_details(grant):
+    """
+    Callback for a result card's "View Details" button.
+    Callbacks run before the next script run, so main() can switch pages
+    straight away instead of first re-rendering every result card (and
+    regenerating its PDF) only to reach the clicked button.
+    """
+    st.session_state.selected_grant = grant
+    st.session_state.pending_page = GRANT_DETAILS_PAGE
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_grant_pdf(grant):
+    """
+    Build (and memoise) the PDF export for a grant.
+    
+    The PDF is the only part of a result card that reads the heavy detail fields
+    (detailed_overview, eligibility, application_requirements). Caching it per
+    grant means those fields are laid out once per search instead of on every
+    rerun of every card.
+    """
+    return generate_grant_pdf(grant)
+
+
 def generate_mock_canadian_grants(filters, query):
     """
     Generate mock Canadian grant data for development purposes.
@@ -305,27 +397,22 @@ def execute_grant_workflow(query: str, filters: dict = None, min_results: int =
     Returns:
         List of filtered, relevant grant results
     """
-    # Import locally and FORCE RELOAD to ensure latest backend code is used
-    # (Streamlit caching can sometimes hold onto old module versions)
-    import importlib
-    import sys
-    import os
-    
     # Ensure project root is in path to import 'backend' as a package
     root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     if root_path not in sys.path:
         sys.path.insert(0, root_path)
 
-    # Reload filters first (dependency)
-    try:
-        filters_module = importlib.import_module("backend.filters")
-        importlib.reload(filters_module)
-    except ImportError:
-        pass # Might not exist or fail, ignore
-        
-    # Import and reload agent
+    # Imported modules are cached in sys.modules, so after the first search this
+    # is a dict lookup. Reloading (which rebuilds every agent and client in
+    # adk_agent) only happens when DEV_RELOAD is set, for editing the backend live.
     agent_module = importlib.import_module("backend.adk_agent")
-    importlib.reload(agent_module)
+    if DEV_RELOAD:
+        try:
+            # Reload filters first (dependency)
+            importlib.reload(importlib.import_module("backend.filters"))
+        except ImportError:
+            pass # Might not exist or fail, ignore
+        agent_module = importlib.reload(agent_module)
     
     # Create a fresh workflow instance each time
     workflow = agent_module.GrantSeekerWorkflow()
@@ -344,6 +431,7 @@ def execute_grant_workflow(query: str, filters: dict = None, min_results: int =
             # Standard single-pass search
             results = loop.run_until_complete(workflow.run(query))
     finally:
+        loop.run_until_complete(workflow.aclose())
         loop.close()
         asyncio.set_event_loop(None)
 
@@ -457,6 +545,12 @@ def render_grant_card(grant, col_key):
     if not tags:
         tags = ["No tags available"]
 
+    # Tags never change once a grant is in search_results, so build the chip
+    # HTML once and keep it on the grant dict instead of re-joining every rerun
+    tags_html = grant.get("_tags_html")
+    if tags_html is None:
+        tags_html = grant["_tags_html"] = "".join(f'<span class="tag">{tag}</span>' for tag in tags)
+
     # Deadline Verification Logic
     deadline_lower = deadline.lower()
     deadline_status = ""
@@ -508,7 +602,7 @@ def render_grant_card(grant, col_key):
                 </div>
                 <p style="color: #4a5568; margin: 0.75rem 0;">{description}</p>
                 <div>
-                    {''.join([f'<span class="tag">{tag}</span>' for tag in tags])}
+                    {tags_html}
                 </div>
             </div>
         """, unsafe_allow_html=True)
@@ -517,12 +611,16 @@ def render_grant_card(grant, col_key):
         btn_col1, btn_col2 = st.columns(2)
         
         with btn_col1:
-            if st.button("📋 View Details", key=f"view_{grant_id}_{col_key}", use_container_width=True):
-                st.session_state.selected_grant = grant
-                st.switch_page("frontend/grant_details.py")
+            st.button(
+                "📋 View Details",
+                key=f"view_{grant_id}_{col_key}",
+                use_container_width=True,
+                on_click=open_grant_details,
+                args=(grant,)
+            )
         
         with btn_col2:
-            pdf_data = generate_grant_pdf(grant)
+            pdf_data = build_grant_pdf(grant)
             st.download_button(
                 label="💾 Download PDF",
                 data=pdf_data,
@@ -552,15 +650,10 @@ def main():
     5. Sidebar with search tips
     """
     
-    # Initialize session state variables
-    if 'search_results' not in st.session_state:
-        st.session_state.search_results = []
-    if 'last_search_tokens' not in st.session_state:
-        st.session_state.last_search_tokens = 0
-    if 'searching' not in st.session_state:
-        st.session_state.searching = False
-    if 'has_searched' not in st.session_state:
-        st.session_state.has_searched = False
+    # Navigate before rendering anything if a "View Details" callback asked to
+    pending_page = st.session_state.pop('pending_page', None)
+    if pending_page:
+        st.switch_page(pending_page)
     
     # Header
     col_back, col_title = st.columns([1, 5])
@@ -648,17 +741,9 @@ def main():
         # FILTER 1: Demographic Focus (Multi-select)
         # Users can select multiple demographic categories. Using key for automatic state binding.
         st.markdown("**🎯 Demographic Focus**")
-        demographic_options = [
-            "Women-led / Female Founders",
-            "Indigenous-led (First Nations, Inuit, Métis)",
-            "Black-led",
-            "BIPOC (General)",
-            "Youth-led (Under 30)",
-            "Newcomers to Canada"
-        ]
         st.multiselect(
             "Select demographic focus",
-            demographic_options,
+            DEMOGRAPHIC_OPTIONS,
             key="demographic_focus",
             label_visibility="collapsed"
         )
@@ -696,16 +781,9 @@ def main():
         # Row 3: Funding Type
         # Users can filter by how the grant is structured (grant vs loan vs tax credit, etc)
         st.markdown("**📝 Funding Type**")
-        funding_type_options = [
-            "Non-repayable Grant",
-            "Repayable Loan / Contribution",
-            "Tax Credit",
-            # "Wage Subsidy (Hiring grants)",
-            # "In-Kind (Services/Equipment)"
-        ]
         st.multiselect(
             "Select funding types",
-            funding_type_options,
+            FUNDING_TYPE_OPTIONS,
             key="funding_types",
             label_visibility="collapsed"
         )
@@ -719,44 +797,19 @@ def main():
         
         with col_geo:
             st.markdown("**🌍 Geographic Scope**")
-            geographic_options = [
-                "",
-                "National (Federal Canada-wide)",
-                "Alberta",
-                "British Columbia",
-                "Manitoba",
-                "New Brunswick",
-                "Newfoundland and Labrador",
-                "Northwest Territories",
-                "Nova Scotia",
-                "Nunavut",
-                "Ontario",
-                "Prince Edward Island",
-                "Quebec",
-                "Saskatchewan",
-                "Yukon",
-                "Rural / Remote (Northern/Rural streams)"
-            ]
             st.session_state.geographic_scope = st.selectbox(
                 "Select geographic scope",
-                geographic_options,
-                index=geographic_options.index(st.session_state.geographic_scope) if st.session_state.geographic_scope in geographic_options else 0,
+                GEOGRAPHIC_OPTIONS,
+                index=GEOGRAPHIC_OPTIONS.index(st.session_state.geographic_scope) if st.session_state.geographic_scope in GEOGRAPHIC_OPTIONS else 0,
                 label_visibility="collapsed"
             )
         
         with col_app:
             st.markdown("**🏢 Applicant Type**")
-            applicant_options = [
-                "",
-                "Registered Non-profit / Charity",
-                "For-profit / Startup",
-                "Academic / Research Institution",
-                "Individual / Artist"
-            ]
             st.session_state.applicant_type = st.selectbox(
                 "Select applicant type",
-                applicant_options,
-                index=applicant_options.index(st.session_state.applicant_type) if st.session_state.applicant_type in applicant_options else 0,
+                APPLICANT_OPTIONS,
+                index=APPLICANT_OPTIONS.index(st.session_state.applicant_type) if st.session_state.applicant_type in APPLICANT_OPTIONS else 0,
                 label_visibility="collapsed"
             )
         
@@ -765,17 +818,10 @@ def main():
         # FILTER 6: Project Stage (Dropdown)
         # Filter by the maturity/stage of the applicant's project
         st.markdown("**🚀 Project Stage**")
-        project_stage_options = [
-            "",
-            "Early Stage / R&D",
-            "Commercialization / Scaling",
-            "Hiring / Training",
-            "Export / International Expansion"
-        ]
         st.session_state.project_stage = st.selectbox(
             "Select project stage",
-            project_stage_options,
-            index=project_stage_options.index(st.session_state.project_stage) if st.session_state.project_stage in project_stage_options else 0,
+            PROJECT_STAGE_OPTIONS,
+            index=PROJECT_STAGE_OPTIONS.index(st.session_state.project_stage) if st.session_state.project_stage in PROJECT_STAGE_OPTIONS else 0,
             label_visibility="collapsed"
         )
         
@@ -786,15 +832,8 @@ def main():
         
         # Show active filters indicator with count
         # Displays when user has selected any filters, notifying them about mock data mode
-        if has_active_filters():
-            active_count = sum([
-                1 if st.session_state.demographic_focus else 0,
-                1 if st.session_state.funding_min is not None or st.session_state.funding_max is not None else 0,
-                1 if st.session_state.funding_types else 0,
-                1 if st.session_state.geographic_scope else 0,
-                1 if st.session_state.applicant_type else 0,
-                1 if st.session_state.project_stage else 0
-            ])
+        active_count = count_active_filters()
+        if active_count:
             # Show appropriate message based on data source
             use_real_data = st.session_state.get('use_real_data_toggle', False)
             if use_real_data:
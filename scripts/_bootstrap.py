@@ -0,0 +1,17 @@
+"""
+Put the project root on sys.path for the debug and demo scripts.
+
+These scripts are run directly (e.g. ``python scripts/debug_tavily.py``), so only
+their own directory is importable. This mirrors tests/_bootstrap.py; it cannot
+simply import that one, since the project root is not importable until it has run. Importing this module first adds the project
+root once, so the backend is always imported by its package name
+(``backend.adk_agent``) and each backend module is loaded a single time,
+whatever the current working directory.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
@@ -1,12 +1,60 @@
 import pandas as pd
+import re
 import hashlib
 import time
 from datetime import datetime
 
-# Read the Excel file using openpyxl engine
+EXCEL_PATH = 'v5_Canadian_Grants_& Loans_Spreadsheet.xlsx'
+
+# Leading protocol with optional "www." and any trailing slashes, stripped to
+# turn a URL into the domain/path used in the annotation pattern
+URL_STRIP_RE = re.compile(r'^https?://(?:www\.)?|/+$')
+
+# XML attribute escaping. Most values contain none of these characters, so the
+# cheap membership precheck skips the translate (and its copy) in the common case.
+_XML_ATTR_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def xml_escape_attr(value):
+    """Escape a string for use inside a double-quoted XML attribute."""
+    if '&' in value or '<' in value or '>' in value or '"' in value:
+        return value.translate(_XML_ATTR_ESCAPES)
+    return value
+
+
+# One annotation block, filled in with a single %-format per row.
+# Slots: about pattern, hex timestamp, original URL, program name (all escaped).
+ANNOTATION_TEMPLATE = (
+    '  <Annotation about="%s" timestamp="%s" score="1.0">\n'
+    '    <Label name="_include_"/>\n'
+    '    <AdditionalData attribute="original_url" value="%s"/>\n'
+    '    <AdditionalData attribute="program_name" value="%s"/>\n'
+    '  </Annotation>\n'
+)
+
+# Only these two columns are used, so only these are parsed.
+# Raw headers contain newlines/extra spaces, hence matching on the cleaned name.
+USED_COLUMNS = {'URL / CONTACT', 'PROGRAM / FUND NAME'}
+
+
+def _is_used_column(name):
+    return str(name).replace('\n', ' ').strip() in USED_COLUMNS
+
+
+def read_spreadsheet(path):
+    """Read the used columns, preferring the Rust-backed calamine reader over openpyxl."""
+    try:
+        return pd.read_excel(path, engine='calamine', usecols=_is_used_column)
+    except (ImportError, ValueError):
+        # python-calamine not installed (ImportError) or pandas < 2.2 (ValueError: unknown engine).
+        # pandas' openpyxl reader already opens the workbook read-only with cached values.
+        return pd.read_excel(path, engine='openpyxl', usecols=_is_used_column)
+
+
+# Read the Excel file
 # We assume the file is in the same directory
 try:
-    df = pd.read_excel('v5_Canadian_Grants_& Loans_Spreadsheet.xlsx', engine='openpyxl')
+    df = read_spreadsheet(EXCEL_PATH)
 except FileNotFoundError as e:
     print(f"❌ Error: Excel file not found - {e}")
     print("   Please ensure 'v5_Canadian_Grants_& Loans_Spreadsheet.xlsx' is in the current directory")
@@ -28,55 +76,54 @@ df.columns = [str(c).replace('\n', ' ').strip() for c in df.columns]
 
 # We will generate <Annotation> elements.
 
-xml_output = '<?xml version="1.0" encoding="UTF-8"?><Annotations>\n'
-
 # Helper to generate timestamp
 # The example annotations.xml uses a hex timestamp? 0x0006485618d2a0a1 matches ~2023
 # We will just generate a hex timestamp based on current time or a deterministic hash
 current_time = int(time.time() * 1000)
 
-for index, row in df.iterrows():
-    url = str(row.get('URL / CONTACT', '')).strip()
-    
-    # Skip empty URLs or "nan"
-    if not url or url.lower() == 'nan' or url.lower() == 'null':
-        continue
-    
-    # Handle multiple URLs in one cell (split by newline or space if messy)
-    # For now, just take the first one if it looks like a URL
-    urls = url.split()
-    target_url = urls[0] if urls else ""
-    
-    if not target_url.startswith('http'):
-        continue
-
-    # Clean URL for 'about' attribute
-    # Remove protocol
-    clean_url = target_url.replace('https://', '').replace('http://', '').rstrip('/')
-    
-    # Handle www prefix logic
-    if clean_url.startswith('www.'):
-        clean_url = clean_url[4:]
-    
-    # Construct the pattern: *.domain.com/*
-    # This matches the domain and any subdomains/paths
-    about_pattern = f"*.{clean_url}/*"
-    
-    # Generate timestamp
-    hex_ts = hex(current_time + index)
-
-    program_name = str(row.get('PROGRAM / FUND NAME', '')).strip()
-    
-    xml_output += f'  <Annotation about="{about_pattern}" timestamp="{hex_ts}" score="1.0">\n'
-    xml_output += f'    <Label name="_include_"/>\n'
-    xml_output += f'    <AdditionalData attribute="original_url" value="{target_url}"/>\n'
-    # Optional: Comment out program name if it causes issues, but it should be valid
-    xml_output += f'    <AdditionalData attribute="program_name" value="{program_name}"/>\n' 
-    xml_output += f'  </Annotation>\n'
-
-xml_output += '</Annotations>'
-
-with open('v5_annotations.xml', 'w') as f:
-    f.write(xml_output)
+# Clean the URL column with vectorized pandas string ops instead of pulling
+# every cell through a per-row Series from df.iterrows()
+empty = pd.Series('', index=df.index, dtype='string')
+urls = df.get('URL / CONTACT', empty).astype('string').str.strip()
+
+# Skip empty URLs or "nan"
+lowered = urls.str.lower()
+urls = urls[urls.notna() & (urls != '') & (lowered != 'nan') & (lowered != 'null')]
+
+# Handle multiple URLs in one cell (split by newline or space if messy)
+# For now, just take the first one if it looks like a URL
+target_urls = urls.str.split(n=1).str[0]
+target_urls = target_urls[target_urls.str.startswith('http')]
+
+# Clean URL for 'about' attribute
+# Remove protocol (+ www prefix) and trailing slashes in one regex pass
+clean_urls = target_urls.str.replace(URL_STRIP_RE, '', regex=True)
+
+# Construct the pattern: *.domain.com/*
+# This matches the domain and any subdomains/paths
+about_patterns = '*.' + clean_urls + '/*'
+
+program_names = df.get('PROGRAM / FUND NAME', empty).loc[target_urls.index].astype(str).str.strip()
+
+# Stream each annotation straight into a buffered file rather than building the
+# whole document in memory first; the 1 MiB buffer batches the actual writes
+with open('v5_annotations.xml', 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+    f.write('<?xml version="1.0" encoding="UTF-8"?><Annotations>\n')
+
+    # Timestamps for all rows in one vectorized add; only hex() runs per row
+    timestamps = (current_time + target_urls.index).tolist()
+
+    for timestamp, about_pattern, target_url, program_name in zip(
+        timestamps, about_patterns, target_urls, program_names
+    ):
+        # Program names often contain "&" (e.g. "Grants & Loans"), so they must be escaped
+        f.write(ANNOTATION_TEMPLATE % (
+            xml_escape_attr(about_pattern),
+            hex(timestamp),
+            xml_escape_attr(target_url),
+            xml_escape_attr(program_name),
+        ))
+
+    f.write('</Annotations>')
 
 print("Successfully converted spreadsheet to v5_annotations.xml")
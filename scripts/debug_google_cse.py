@@ -9,19 +9,21 @@ Usage:
 """
 import asyncio
 import os
-import sys
 import logging
-from pathlib import Path
+from logging.handlers import MemoryHandler
 from dotenv import load_dotenv
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-from google_search_client import GoogleSearchClient
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from backend.google_search_client import GoogleSearchClient
 
 # Configure logging
+# Records are buffered and written in batches rather than one write per line;
+# errors (and the end of the script) flush the buffer immediately.
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    handlers=[MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=stream_handler)]
 )
 logger = logging.getLogger(__name__)
 
@@ -41,8 +43,6 @@ async def debug_search():
     """Run debug queries against Google CSE."""
     logger.info(f"Testing Google CSE with ID: {CSE_ID[:10]}...")
     
-    client = GoogleSearchClient(api_key=API_KEY, cse_id=CSE_ID)
-    
     # Test Queries designed to hit specific parts of your Golden Dataset
     queries = [
         "women entrepreneur funding",   # Targeted at Row 12 / Row 62
@@ -50,9 +50,15 @@ async def debug_search():
         "indigenous business loan",     # Targeted at Row 13 / Row 59
     ]
     
-    for q in queries:
+    # One client (and so one pooled connection) serves every query, and the
+    # queries run concurrently; results are logged in query order afterwards.
+    async with GoogleSearchClient(api_key=API_KEY, cse_id=CSE_ID) as client:
+        results_list = await asyncio.gather(
+            *(client.search(q, max_results=3) for q in queries)
+        )
+    
+    for q, results in zip(queries, results_list):
         logger.info(f"Query: '{q}'")
-        results = await client.search(q, max_results=3)
         
         if not results:
             logger.warning("No results found. Check API Key or CSE Configuration")
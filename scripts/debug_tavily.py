@@ -5,18 +5,19 @@ This is a development/debugging tool, not a unit test. It's used to manually
 verify that the Tavily client can extract content from problematic URLs.
 
 Usage:
-    python scripts/debug_tavily.py
+    python scripts/debug_tavily.py [URL ...]
+
+With no arguments the known problematic TEST_URL is probed. Several URLs are
+probed concurrently, each with its own PROBE_TIMEOUT.
 """
 import asyncio
 import os
 import sys
 import logging
-from pathlib import Path
 from dotenv import load_dotenv
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-from tavily_client import TavilyClient
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from backend.tavily_client import shared_tavily_client
 
 # Configure logging
 logging.basicConfig(
@@ -32,27 +33,42 @@ load_dotenv()
 TEST_URL = "https://www.sac-isc.gc.ca/eng/1375201178602/1610797286236"
 API_KEY = os.getenv("TAVILY_API_KEY")
 
+# Per-URL limit, so one hanging page cannot stall the whole sweep
+PROBE_TIMEOUT = 30
+
 # Validate that required environment variable is set
 if not API_KEY:
     raise ValueError("TAVILY_API_KEY must be set in .env file")
 
-async def debug_tavily_extraction():
-    """Test Tavily content extraction with a known problematic URL."""
-    logger.info(f"Testing Tavily Extraction for: {TEST_URL}")
+async def probe(client, url):
+    """Extract one URL, returning None if it does not finish within PROBE_TIMEOUT."""
+    try:
+        return await asyncio.wait_for(client.get_page_content(url), PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error(f"✗ TIMEOUT: {url} did not respond within {PROBE_TIMEOUT}s")
+        return None
+
+async def debug_tavily_extraction(urls):
+    """Test Tavily content extraction for each URL concurrently."""
+    logger.info(f"Testing Tavily Extraction for: {', '.join(urls)}")
     logger.info(f"Using API Key: {API_KEY[:5]}...")
     
-    client = TavilyClient(api_key=API_KEY)
+    async with shared_tavily_client(API_KEY) as client:
+        logger.info("Attempting content extraction...")
+        # return_exceptions=True: one failing URL doesn't cancel the other probes
+        results = await asyncio.gather(*(probe(client, url) for url in urls), return_exceptions=True)
     
-    logger.info("Attempting content extraction...")
-    content = await client.get_page_content(TEST_URL)
-    
-    logger.info("=" * 60)
-    if content:
-        logger.info(f"✓ SUCCESS: Extracted {len(content)} characters")
-        logger.info(f"Preview (first 500 chars):\n{content[:500]}...")
-    else:
-        logger.error("✗ FAILED: Content is empty or None")
+    for url, content in zip(urls, results):
+        logger.info("=" * 60)
+        logger.info(f"URL: {url}")
+        if isinstance(content, Exception):
+            logger.error(f"✗ FAILED: {type(content).__name__}: {content}")
+        elif content:
+            logger.info(f"✓ SUCCESS: Extracted {len(content)} characters")
+            logger.info(f"Preview (first 500 chars):\n{content[:500]}...")
+        else:
+            logger.error("✗ FAILED: Content is empty or None")
     logger.info("=" * 60)
 
 if __name__ == "__main__":
-    asyncio.run(debug_tavily_extraction())
+    asyncio.run(debug_tavily_extraction(sys.argv[1:] or [TEST_URL]))
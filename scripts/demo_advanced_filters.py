@@ -1,35 +1,87 @@
 import asyncio
 import logging
-import sys
-import os
+from logging.handlers import MemoryHandler
 
-# Add backend to path so we can import the agent
-sys.path.insert(0, os.path.abspath('backend'))
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
 
-from adk_agent import GrantSeekerWorkflow
+from backend.adk_agent import GrantSeekerWorkflow
 
 # Configure logging to be clean and readable
-logging.basicConfig(level=logging.ERROR) # Hide debug logs
-logger = logging.getLogger("adk_agent")
+# Agent progress logs arrive in bursts from concurrent scenarios; buffer them
+# and write in batches (errors flush immediately).
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+logging.basicConfig(
+    level=logging.ERROR, # Hide debug logs
+    handlers=[MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=stream_handler)]
+)
+logger = logging.getLogger("backend.adk_agent")
 logger.setLevel(logging.INFO) # Show agent info
 
-async def run_scenario(name, query, filters, min_results=2):
-    print(f"\n{'-'*80}")
-    print(f"🎬 SCENARIO: {name}")
-    print(f"🔎 Query: '{query}'")
-    print(f"🔧 Filters: {filters}")
-    print(f"{'-'*80}")
-    
-    workflow = GrantSeekerWorkflow()
+# Maximum number of scenarios searching at once; keeps the search and
+# extraction APIs under their rate limits while the scenarios overlap.
+MAX_CONCURRENT_SCENARIOS = 2
+
+SCENARIOS = [
+    # 1. Women Entrepreneurs (Demographic Filter)
+    {
+        "name": "Women-Led Startups",
+        "query": "startup funding Canada",
+        "filters": {'demographic_focus': ['Women-led / Female Founders']}
+    },
+    # 2. Indigenous Business (Demographic Filter)
+    {
+        "name": "Indigenous Business Support",
+        "query": "business loans",
+        "filters": {'demographic_focus': ['Indigenous']}
+    },
+    # 3. Specific Sector (Agriculture) - No strict filter
+    {
+        "name": "Agriculture Tech Grants",
+        "query": "agriculture technology",
+        "filters": {} # No hard filters, relying on query + ranking
+    },
+    # 4. Ontario Only (Geographic Filter)
+    {
+        "name": "Ontario Tech Grants",
+        "query": "tech grants",
+        "filters": {'geographic_scope': 'Ontario'}
+    },
+    # 5. High Value Filter (Funding Min > $50k)
+    # Note: 'funding_min' logic in backend skips grants without sufficient amount info
+    {
+        "name": "High Value Grants (>$50k)",
+        "query": "business expansion grants",
+        "filters": {'funding_min': 50000}
+    },
+]
+
+async def run_scenario(workflow, sem, query, filters, min_results=2):
+    """Run the iterative search for one scenario, gated by the shared semaphore."""
+    async with sem:
+        return await workflow.run_with_minimum_results(
+            query=query,
+            filters=filters,
+            min_results=min_results
+        )
+
+def print_scenario(name, query, filters, results):
+    # Build the whole scenario report first and print it once,
+    # rather than one print call per line
+    lines = [
+        f"\n{'-'*80}",
+        f"🎬 SCENARIO: {name}",
+        f"🔎 Query: '{query}'",
+        f"🔧 Filters: {filters}",
+        f"{'-'*80}",
+    ]
     
-    # Run the iterative search
-    results = await workflow.run_with_minimum_results(
-        query=query,
-        filters=filters,
-        min_results=min_results
-    )
+    if isinstance(results, Exception):
+        lines.append(f"\n❌ SCENARIO FAILED: {type(results).__name__}: {results}")
+        print('\n'.join(lines))
+        return
     
-    print(f"\n✅ RESULTS FOUND: {len(results)}")
+    lines.append(f"\n✅ RESULTS FOUND: {len(results)}")
     
     for i, g in enumerate(results, 1):
         title = g.get('title', 'Unknown Title')
@@ -39,51 +91,34 @@ async def run_scenario(name, query, filters, min_results=2):
         amount = g.get('amount', 'Unknown')
         valid = "✅" if g.get('url') else "❌"
         
-        print(f"\n   {i}. {title}")
-        print(f"      Fit Score: {fit}%")
-        print(f"      Demographics: {demos}")
-        print(f"      Location: {location}")
-        print(f"      Amount: {amount}")
-        print(f"      URL Valid: {valid}")
+        lines.append(
+            f"\n   {i}. {title}\n"
+            f"      Fit Score: {fit}%\n"
+            f"      Demographics: {demos}\n"
+            f"      Location: {location}\n"
+            f"      Amount: {amount}\n"
+            f"      URL Valid: {valid}"
+        )
+    
+    print('\n'.join(lines))
 
 async def main():
     print("🚀 STARTING ADVANCED FILTER DEMO...\n")
 
-    # 1. Women Entrepreneurs (Demographic Filter)
-    await run_scenario(
-        name="Women-Led Startups",
-        query="startup funding Canada",
-        filters={'demographic_focus': ['Women-led / Female Founders']}
-    )
-
-    # 2. Indigenous Business (Demographic Filter)
-    await run_scenario(
-        name="Indigenous Business Support",
-        query="business loans",
-        filters={'demographic_focus': ['Indigenous']}
-    )
-
-    # 3. Specific Sector (Agriculture) - No strict filter
-    await run_scenario(
-        name="Agriculture Tech Grants",
-        query="agriculture technology",
-        filters={} # No hard filters, relying on query + ranking
-    )
+    # The scenarios are independent, so share one workflow, search them
+    # concurrently and print each one in order once they have all finished.
+    workflow = GrantSeekerWorkflow()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_SCENARIOS)
+    try:
+        results_list = await asyncio.gather(
+            *(run_scenario(workflow, sem, s['query'], s['filters']) for s in SCENARIOS),
+            return_exceptions=True
+        )
+    finally:
+        await workflow.aclose()
 
-    # 4. Ontario Only (Geographic Filter)
-    await run_scenario(
-        name="Ontario Tech Grants",
-        query="tech grants",
-        filters={'geographic_scope': 'Ontario'}
-    )
-    
-    # 5. High Value Filter (Funding Min > $50k)
-    # Note: 'funding_min' logic in backend skips grants without sufficient amount info
-    await run_scenario(
-        name="High Value Grants (>$50k)",
-        query="business expansion grants",
-        filters={'funding_min': 50000}
-    )
+    for scenario, results in zip(SCENARIOS, results_list):
+        print_scenario(scenario['name'], scenario['query'], scenario['filters'], results)
 
 if __name__ == "__main__":
     try:
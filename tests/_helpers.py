@@ -0,0 +1,73 @@
+"""
+Shared helpers for the scripts in this directory.
+"""
+import asyncio
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import uvloop  # Optional: faster event loop for the concurrent network calls
+except ImportError:
+    uvloop = None
+
+# Maximum number of workflow queries in flight at once; keeps the search
+# and extraction APIs under their rate limits while the queries overlap.
+MAX_CONCURRENT_QUERIES = 2
+
+
+async def run_query(workflow, sem, query, filters=None, min_results=1):
+    """
+    Run a single workflow query, gated by the shared semaphore.
+
+    Without filters this is the cached search; with filters (even empty ones)
+    it is the iterative search, which stops once min_results grants match.
+    """
+    async with sem:
+        if filters is None:
+            return await workflow.run_cached(query)
+        return await workflow.run_with_minimum_results(
+            query=query,
+            filters=filters,
+            min_results=min_results
+        )
+
+
+@contextmanager
+def queued_logging(level=logging.WARNING):
+    """
+    Route logging through a queue for the duration of the block.
+
+    Log records emitted by the backend while the concurrent requests are in
+    flight are queued and written by a background thread, so the event loop
+    never blocks on terminal output.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    root = logging.getLogger()
+    previous_level = root.level
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+    try:
+        yield
+    finally:
+        # Detach first, so records logged after the block aren't queued unread
+        root.removeHandler(queue_handler)
+        root.setLevel(previous_level)
+        listener.stop()
+
+
+def run(coro):
+    """Run ``coro`` to completion on a fresh event loop, using uvloop when installed."""
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+            return runner.run(coro)
+    # asyncio.Runner is 3.11+; on 3.10 switch the loop policy instead
+    if uvloop:
+        uvloop.install()
+    return asyncio.run(coro)
@@ -6,8 +6,9 @@ Tests challenging scenarios to validate system robustness
 """
 
 import asyncio
-import sys
-sys.path.insert(0, 'backend')
+import os
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from _helpers import MAX_CONCURRENT_QUERIES, queued_logging, run, run_query
 
 
 ADVANCED_TESTS = [
@@ -38,10 +39,9 @@ ADVANCED_TESTS = [
     },
 ]
 
-
-async def test_robustness():
-    """Test system robustness with challenging queries."""
-    from adk_agent import GrantSeekerWorkflow
+async def test_robustness(sem=None):
+    """Test system robustness with challenging queries (sem: optional shared query semaphore)."""
+    from backend.adk_agent import GrantSeekerWorkflow
     
     print("=" * 80)
     print("ADVANCED ROBUSTNESS & ACCURACY TESTS")
@@ -51,7 +51,19 @@ async def test_robustness():
     
     results_summary = []
     
-    for test in ADVANCED_TESTS:
+    # The test queries are independent, so run them concurrently and
+    # analyse each one in order once they have all finished.
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    try:
+        results_list = await asyncio.gather(
+            *(run_query(workflow, sem, t['query']) for t in ADVANCED_TESTS),
+            return_exceptions=True
+        )
+    finally:
+        await workflow.aclose()
+    
+    for test, results in zip(ADVANCED_TESTS, results_list):
         print(f"\n{'=' * 80}")
         print(f"TEST: {test['name']}")
         print(f"Query: \"{test['query']}\"")
@@ -59,33 +71,43 @@ async def test_robustness():
         print('=' * 80)
         
         try:
-            results = await workflow.run(test['query'])
+            if isinstance(results, Exception):
+                raise results
+            
+            # Analyze results (all counters in one pass over the grants)
+            untitled = with_errors = complete_data = 0
+            for g in results:
+                is_untitled = g.get('title') == 'Untitled Grant'
+                untitled += is_untitled
+                if g.get('error'):
+                    with_errors += 1
+                if not is_untitled and len(g.get('description', '')) >= 50:
+                    complete_data += 1
             
-            # Analyze results
             analysis = {
                 "total": len(results),
-                "untitled": len([g for g in results if g.get('title') == 'Untitled Grant']),
-                "with_errors": len([g for g in results if g.get('error')]),
-                "complete_data": len([
-                    g for g in results 
-                    if len(g.get('description', '')) >= 50
-                    and g.get('title') != 'Untitled Grant'
-                ]),
+                "untitled": untitled,
+                "with_errors": with_errors,
+                "complete_data": complete_data,
             }
             
-            print(f"\n📊 Results:")
-            print(f"   Total grants: {analysis['total']}")
-            print(f"   Complete data: {analysis['complete_data']}/{analysis['total']}")
-            print(f"   'Untitled Grant': {analysis['untitled']}")
-            print(f"   With errors: {analysis['with_errors']}")
+            print(
+                f"\n📊 Results:\n"
+                f"   Total grants: {analysis['total']}\n"
+                f"   Complete data: {analysis['complete_data']}/{analysis['total']}\n"
+                f"   'Untitled Grant': {analysis['untitled']}\n"
+                f"   With errors: {analysis['with_errors']}"
+            )
             
             # Show relevance of top result
             if results:
                 top_grant = results[0]
-                print(f"\n🏆 Top Result:")
-                print(f"   {top_grant.get('title', 'NO TITLE')}")
-                print(f"   Fit Score: {top_grant.get('fit_score', 0)}%")
-                print(f"   {top_grant.get('description', 'No description')[:100]}...")
+                print(
+                    f"\n🏆 Top Result:\n"
+                    f"   {top_grant.get('title', 'NO TITLE')}\n"
+                    f"   Fit Score: {top_grant.get('fit_score', 0)}%\n"
+                    f"   {top_grant.get('description', 'No description')[:100]}..."
+                )
             
             # Verdict
             print(f"\n✅ Status:")
@@ -142,35 +164,57 @@ async def test_robustness():
         print(f"\n⚠️ {total - passed} tests had issues")
 
 
-async def test_accuracy():
-    """Test accuracy of grant data extraction."""
-    from adk_agent import GrantSeekerWorkflow
+# Broad topic fetched once for the accuracy checks; each known grant is then
+# looked up in this pool locally instead of with its own narrow query
+ACCURACY_POOL_QUERY = "NSERC grants"
+
+
+async def fetch_accuracy_pool(sem=None):
+    """Run the broad accuracy query once and return its grants (sem: optional shared query semaphore)."""
+    from backend.adk_agent import GrantSeekerWorkflow
     
+    workflow = GrantSeekerWorkflow()
+    # GS_FORCE_FRESH=1 skips the cached result, e.g. for full-fidelity nightly runs
+    force_fresh = os.getenv("GS_FORCE_FRESH", "").lower() in ("1", "true", "yes")
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    try:
+        async with sem:
+            return await workflow.run_cached(ACCURACY_POOL_QUERY, force_fresh=force_fresh)
+    finally:
+        await workflow.aclose()
+
+
+async def test_accuracy(pool=None):
+    """Test accuracy of grant data extraction."""
     print("\n" + "=" * 80)
     print("ACCURACY TEST - Known Grant Verification")
     print("=" * 80)
     
-    # Test with well-known grants that should always appear
-    known_grants_query = "NSERC Discovery Grants"
+    # Test with a well-known grant that should always appear
+    known_grant_marker = 'Discovery'
     
-    print(f"\nQuery: \"{known_grants_query}\"")
+    print(f"\nPool query: \"{ACCURACY_POOL_QUERY}\"")
     print("Expected: Should find NSERC Discovery Grants\n")
     
-    workflow = GrantSeekerWorkflow()
-    results = await workflow.run(known_grants_query)
+    if pool is None:
+        pool = await fetch_accuracy_pool()
+    results = [g for g in pool if known_grant_marker in g.get('title', '')]
     
     # Check if well-known grant was found
-    nserc_found = any('NSERC' in g.get('title', '') or 'Discovery' in g.get('title', '') for g in results)
+    nserc_found = bool(results)
     
-    print(f"Results: {len(results)} grants")
-    print(f"NSERC/Discovery found: {'✅ YES' if nserc_found else '❌ NO'}")
+    print(f"Results: {len(results)} of {len(pool)} grants")
+    print(f"NSERC Discovery found: {'✅ YES' if nserc_found else '❌ NO'}")
     
     # Show top 3
     print(f"\nTop 3 Results:")
-    for i, grant in enumerate(results[:3], 1):
-        print(f"\n{i}. {grant.get('title', 'NO TITLE')}")
-        print(f"   Funder: {grant.get('funder', 'Unknown')}")
-        print(f"   Fit Score: {grant.get('fit_score', 0)}%")
+    print(''.join(
+        f"\n{i}. {grant.get('title', 'NO TITLE')}\n"
+        f"   Funder: {grant.get('funder', 'Unknown')}\n"
+        f"   Fit Score: {grant.get('fit_score', 0)}%\n"
+        for i, grant in enumerate(results[:3], 1)
+    ), end='')
     
     if nserc_found and len(results) > 0:
         print("\n✅ ACCURACY TEST PASSED")
@@ -182,7 +226,18 @@ async def test_accuracy():
 
 if __name__ == "__main__":
     async def run_all():
-        await test_robustness()
-        await test_accuracy()
-    
-    asyncio.run(run_all())
+        # Prefetch the accuracy pool while the robustness tests run; both share
+        # one semaphore so the prefetch counts towards MAX_CONCURRENT_QUERIES
+        sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        pool = asyncio.create_task(fetch_accuracy_pool(sem))
+        try:
+            await test_robustness(sem)
+            await test_accuracy(await pool)
+        finally:
+            if not pool.done():
+                pool.cancel()
+            # Reap the task even on failure, so it never outlives the loop
+            await asyncio.gather(pool, return_exceptions=True)
+    
+    with queued_logging():  # warnings and errors only, as before
+        run(run_all())
@@ -13,10 +13,13 @@ Run this to verify all issues are fixed.
 """
 
 import asyncio
+import io
 import sys
-sys.path.insert(0, 'backend')
+from contextlib import redirect_stdout
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from _helpers import MAX_CONCURRENT_QUERIES, run_query
 
-from adk_agent import GrantSeekerWorkflow
+from backend.adk_agent import GrantSeekerWorkflow
 
 
 # Test queries that previously caused "Untitled Grant" issues
@@ -47,7 +50,6 @@ TEST_QUERIES = {
     },
 }
 
-
 async def run_azzi_tests():
     """Run all test cases that Azzi struggled with."""
     
@@ -59,82 +61,99 @@ async def run_azzi_tests():
     workflow = GrantSeekerWorkflow()
     all_results = {}
     
-    for test_id, test_case in TEST_QUERIES.items():
-        print(f"\n{'=' * 80}")
-        print(f"TEST: {test_id}")
-        print(f"Query: '{test_case['query']}'")
-        print(f"Description: {test_case['description']}")
-        print(f"Previously caused: {', '.join(test_case['expected_issues'])}")
-        print('=' * 80)
-        
-        try:
-            results = await workflow.run(test_case['query'])
-            all_results[test_id] = results
-            
-            print(f"\n✅ Search completed: {len(results)} grants found")
-            
-            # Validate results
-            issues_found = []
-            
-            # Check 1: Any "Untitled Grant"?
-            untitled = [g for g in results if g.get('title') == 'Untitled Grant']
-            if untitled:
-                issues_found.append(f"❌ {len(untitled)} 'Untitled Grant' found")
-            else:
-                print("✅ No 'Untitled Grant' - FIXED")
-            
-            # Check 2: Any empty descriptions?
-            empty_desc = [g for g in results if len(g.get('description', '')) < 50]
-            if empty_desc:
-                issues_found.append(f"❌ {len(empty_desc)} grants with empty/short descriptions")
-            else:
-                print("✅ All grants have sufficient descriptions - FIXED")
+    # The queries are independent, so run them concurrently and report
+    # each one in order once they have all finished.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    try:
+        results_list = await asyncio.gather(
+            *(run_query(workflow, sem, tc['query']) for tc in TEST_QUERIES.values()),
+            return_exceptions=True
+        )
+    finally:
+        await workflow.aclose()
+    
+    # The per-test report is many small prints; collect it in memory and
+    # write it to the terminal in one go instead of one write per line.
+    with redirect_stdout(io.StringIO()) as report:
+        for (test_id, test_case), results in zip(TEST_QUERIES.items(), results_list):
+            print(f"\n{'=' * 80}")
+            print(f"TEST: {test_id}")
+            print(f"Query: '{test_case['query']}'")
+            print(f"Description: {test_case['description']}")
+            print(f"Previously caused: {', '.join(test_case['expected_issues'])}")
+            print('=' * 80)
             
-            # Check 3: All have required fields?
-            for i, grant in enumerate(results):
-                missing = []
-                if not grant.get('title'):
-                    missing.append('title')
-                if not grant.get('url'):
-                    missing.append('url')
-                if not grant.get('description'):
-                    missing.append('description')
+            try:
+                if isinstance(results, Exception):
+                    raise results
+                all_results[test_id] = results
                 
-                if missing:
-                    issues_found.append(f"❌ Grant {i+1} missing: {', '.join(missing)}")
-            
-            if not issues_found:
-                print("✅ All grants have complete data - FIXED")
-            
-            # Show sample results
-            print(f"\nSample Results (showing first 2):")
-            for i, grant in enumerate(results[:2], 1):
-                print(f"\n{i}. {grant.get('title', 'NO TITLE')}")
-                print(f"   Funder: {grant.get('funder', 'Unknown')}")
-                print(f"   Amount: {grant.get('amount', 'Not specified')}")
-                print(f"   Deadline: {grant.get('deadline', 'Not specified')}")
-                print(f"   Description: {grant.get('description', 'No description')[:80]}...")
-                if grant.get('error'):
-                    print(f"   ⚠️ ERROR: {grant['error']}")
-            
-            # Summary
-            if issues_found:
-                print(f"\n⚠️ ISSUES FOUND:")
-                for issue in issues_found:
-                    print(f"   {issue}")
-            else:
-                print(f"\n✅ ALL CHECKS PASSED - ISSUES FIXED!")
-            
-            # Check if minimum grants found
-            if len(results) >= test_case['min_grants']:
-                print(f"✅ Found {len(results)} grants (minimum {test_case['min_grants']})")
-            else:
-                print(f"⚠️ Only {len(results)} grants found (expected minimum {test_case['min_grants']})")
+                print(f"\n✅ Search completed: {len(results)} grants found")
+                
+                # Validate results
+                issues_found = []
+                
+                # Check 1: Any "Untitled Grant"?
+                untitled = [g for g in results if g.get('title') == 'Untitled Grant']
+                if untitled:
+                    issues_found.append(f"❌ {len(untitled)} 'Untitled Grant' found")
+                else:
+                    print("✅ No 'Untitled Grant' - FIXED")
+                
+                # Check 2: Any empty descriptions?
+                empty_desc = [g for g in results if len(g.get('description', '')) < 50]
+                if empty_desc:
+                    issues_found.append(f"❌ {len(empty_desc)} grants with empty/short descriptions")
+                else:
+                    print("✅ All grants have sufficient descriptions - FIXED")
+                
+                # Check 3: All have required fields?
+                for i, grant in enumerate(results):
+                    missing = []
+                    if not grant.get('title'):
+                        missing.append('title')
+                    if not grant.get('url'):
+                        missing.append('url')
+                    if not grant.get('description'):
+                        missing.append('description')
+                    
+                    if missing:
+                        issues_found.append(f"❌ Grant {i+1} missing: {', '.join(missing)}")
                 
-        except Exception as e:
-            print(f"\n❌ FATAL ERROR: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
+                if not issues_found:
+                    print("✅ All grants have complete data - FIXED")
+                
+                # Show sample results
+                print(f"\nSample Results (showing first 2):")
+                for i, grant in enumerate(results[:2], 1):
+                    print(f"\n{i}. {grant.get('title', 'NO TITLE')}")
+                    print(f"   Funder: {grant.get('funder', 'Unknown')}")
+                    print(f"   Amount: {grant.get('amount', 'Not specified')}")
+                    print(f"   Deadline: {grant.get('deadline', 'Not specified')}")
+                    print(f"   Description: {grant.get('description', 'No description')[:80]}...")
+                    if grant.get('error'):
+                        print(f"   ⚠️ ERROR: {grant['error']}")
+                
+                # Summary
+                if issues_found:
+                    print(f"\n⚠️ ISSUES FOUND:")
+                    for issue in issues_found:
+                        print(f"   {issue}")
+                else:
+                    print(f"\n✅ ALL CHECKS PASSED - ISSUES FIXED!")
+                
+                # Check if minimum grants found
+                if len(results) >= test_case['min_grants']:
+                    print(f"✅ Found {len(results)} grants (minimum {test_case['min_grants']})")
+                else:
+                    print(f"⚠️ Only {len(results)} grants found (expected minimum {test_case['min_grants']})")
+                    
+            except Exception as e:
+                print(f"\n❌ FATAL ERROR: {type(e).__name__}: {e}")
+                import traceback
+                traceback.print_exc(file=sys.stdout)
+    
+    sys.stdout.write(report.getvalue())
     
     # Final Summary
     print("\n" + "=" * 80)
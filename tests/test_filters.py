@@ -11,10 +11,52 @@ Tests Advanced Filters with Real Data to ensure:
 """
 
 import asyncio
-import sys
-sys.path.insert(0, 'backend')
+import re
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from _helpers import MAX_CONCURRENT_QUERIES, run_query
 
-from adk_agent import GrantSeekerWorkflow
+from backend.adk_agent import GrantSeekerWorkflow
+from backend.filters import expand_demographic_terms
+
+# Placeholder values that count as a missing critical field
+MISSING_TITLES = ('Untitled Grant', '', None)
+MISSING_VALUES = ('Not specified', '', None)
+
+
+def search_blob(grant):
+    """
+    Return the grant's title, description, demographics and tags as one
+    lowercased string, built once and stored on the grant as '_blob' so
+    every later keyword check reuses it.
+    """
+    blob = grant.get('_blob')
+    if blob is None:
+        blob = ' '.join([
+            grant.get('title', ''),
+            grant.get('description', ''),
+            *grant.get('founder_demographics', []),
+            *grant.get('tags', []),
+        ]).lower()
+        grant['_blob'] = blob
+    return blob
+
+
+def demographics_text(grant):
+    """
+    Return the grant's founder demographics lowercased and newline-joined,
+    stored on the grant as '_demo_text' so the filter and the checks share it.
+    Newlines keep a keyword from matching across two separate entries.
+    """
+    text = grant.get('_demo_text')
+    if text is None:
+        text = '\n'.join(grant.get('founder_demographics', [])).lower()
+        grant['_demo_text'] = text
+    return text
+
+
+def keyword_pattern(keywords):
+    """Compile keywords into one alternation so a text is scanned once for all of them."""
+    return re.compile('|'.join(re.escape(kw.lower()) for kw in keywords))
 
 
 class FilterTester:
@@ -23,6 +65,22 @@ class FilterTester:
     def __init__(self):
         self.workflow = GrantSeekerWorkflow()
         self.test_results = []
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    
+    async def _run_queries(self, queries):
+        """Run independent queries concurrently, returning results in order."""
+        return await asyncio.gather(
+            *(run_query(self.workflow, self._sem, q) for q in queries),
+            return_exceptions=True
+        )
+    
+    async def _run_filtered_query(self, query, filters, min_results=1):
+        """
+        Run a query with the filters applied by the backend, gated by the
+        shared semaphore. Non-matching grants are dropped inside the workflow,
+        which stops searching once min_results matching grants are found.
+        """
+        return await run_query(self.workflow, self._sem, query, filters, min_results)
     
     async def test_demographic_filter(self):
         """Test that demographic filters work correctly."""
@@ -34,47 +92,55 @@ class FilterTester:
             {
                 "query": "business funding",
                 "filter_demographic": "Women",
-                "should_contain": ["women", "female"],
                 "should_not_contain": ["only indigenous", "only youth"]
             },
             {
                 "query": "startup grants",
                 "filter_demographic": "Indigenous",
-                "should_contain": ["indigenous", "first nations"],
                 "should_not_contain": ["only women", "only youth"]
             }
         ]
         
-        for test in test_cases:
+        results_list = await asyncio.gather(
+            *(
+                self._run_filtered_query(
+                    t['query'],
+                    {'demographic_focus': [t['filter_demographic']]}
+                )
+                for t in test_cases
+            ),
+            return_exceptions=True
+        )
+        
+        for test, results in zip(test_cases, results_list):
             print(f"\nTest: {test['query']} + {test['filter_demographic']} filter")
             
-            # Get results
-            results = await self.workflow.run(test['query'])
-            print(f"Total results before filter: {len(results)}")
+            if isinstance(results, Exception):
+                print(f"   ❌ FAIL: {type(results).__name__}: {results}")
+                self.test_results.append({
+                    "test": f"Demographic: {test['filter_demographic']}",
+                    "passed": False,
+                    "count": 0
+                })
+                continue
             
-            # Simulate demographic filter
-            filtered = [
-                g for g in results
-                if any(keyword in demo.lower() for demo in g.get('founder_demographics', []) for keyword in test['should_contain'])
-            ]
+            print(f"Results from backend {test['filter_demographic']} filter: {len(results)}")
             
-            print(f"Results after {test['filter_demographic']} filter: {len(filtered)}")
+            # Re-check the backend's demographic filter with its own keyword
+            # rules: every result must match one of the expanded terms
+            demo_pattern = keyword_pattern(expand_demographic_terms([test['filter_demographic']]))
             
             # Check results
             passed = True
-            for grant in filtered:
-                demographics = [d.lower() for d in grant.get('founder_demographics', [])]
-                
+            for grant in results:
                 # Must contain expected keywords
-                if not any(kw in ' '.join(demographics) for kw in test['should_contain']):
+                if not demo_pattern.search(demographics_text(grant)):
                     print(f"   ❌ FAIL: {grant.get('title', 'Unknown')} missing expected demographic")
-                    print(f"      Has: {demographics}")
+                    print(f"      Has: {[d.lower() for d in grant.get('founder_demographics', [])]}")
                     passed = False
                 
                 # Should not ONLY have other demographics
-                title = grant.get('title', '').lower()
-                desc = grant.get('description', '').lower()
-                combined = title + ' ' + desc + ' '.join(demographics)
+                combined = search_blob(grant)
                 
                 # Check if it's exclusively for another demographic
                 is_women_only = 'women' in combined and 'only women' in combined
@@ -84,15 +150,15 @@ class FilterTester:
                     print(f"   ❌ FAIL: {grant.get('title')} is indigenous-only, not women")
                     passed = False
             
-            if passed and len(filtered) > 0:
-                print(f"   ✅ PASS: All {len(filtered)} results match {test['filter_demographic']} filter")
-            elif len(filtered) == 0:
+            if passed and len(results) > 0:
+                print(f"   ✅ PASS: All {len(results)} results match {test['filter_demographic']} filter")
+            elif len(results) == 0:
                 print(f"   ⚠️  WARNING: No results found for {test['filter_demographic']}")
             
             self.test_results.append({
                 "test": f"Demographic: {test['filter_demographic']}",
                 "passed": passed,
-                "count": len(filtered)
+                "count": len(results)
             })
     
     async def test_relevance_accuracy(self):
@@ -119,10 +185,20 @@ class FilterTester:
             }
         ]
         
-        for test in test_queries:
+        results_list = await self._run_queries(t['query'] for t in test_queries)
+        
+        for test, results in zip(test_queries, results_list):
             print(f"\nQuery: '{test['query']}'")
             
-            results = await self.workflow.run(test['query'])
+            if isinstance(results, Exception):
+                print(f"   ❌ FAIL: {type(results).__name__}: {results}")
+                self.test_results.append({
+                    "test": f"Relevance: {test['query']}",
+                    "passed": False,
+                    "count": 0
+                })
+                continue
+            
             print(f"Results found: {len(results)}")
             
             if len(results) < test['min_results']:
@@ -135,17 +211,13 @@ class FilterTester:
                 continue
             
             # Check relevance
+            relevant_pattern = keyword_pattern(test['must_contain_keywords'])
             relevant_count = 0
             for grant in results:
-                title = grant.get('title', '').lower()
-                desc = grant.get('description', '').lower()
-                demographics = ' '.join(grant.get('founder_demographics', [])).lower()
-                tags = ' '.join(grant.get('tags', [])).lower()
-                
-                combined = f"{title} {desc} {demographics} {tags}"
+                combined = search_blob(grant)
                 
                 # Check if ANY required keyword appears
-                is_relevant = any(kw in combined for kw in test['must_contain_keywords'])
+                is_relevant = relevant_pattern.search(combined) is not None
                 
                 if is_relevant:
                     relevant_count += 1
@@ -174,24 +246,29 @@ class FilterTester:
         print("TEST 3: DATA COMPLETENESS")
         print("=" * 80)
         
-        results = await self.workflow.run("research grants")
+        results = await self.workflow.run_cached("research grants")
         print(f"\nTesting {len(results)} grants for completeness...")
         
         issues = []
         for grant in results:
+            # Look each field up once; all three checks below share them
+            title = grant.get('title')
+            deadline = grant.get('deadline')
+            amount = grant.get('amount')
+            
             # Check required fields
-            if grant.get('title') == 'Untitled Grant':
+            if title == 'Untitled Grant':
                 issues.append(f"Untitled Grant: {grant.get('url', 'unknown')}")
             
             if len(grant.get('description', '')) < 50:
                 issues.append(f"Short description: {grant.get('title', 'unknown')}")
             
             # Check has at least 2/3 critical fields
-            has_title = grant.get('title') not in ['Untitled Grant', '', None]
-            has_deadline = grant.get('deadline') not in ['Not specified', '', None]
-            has_amount = grant.get('amount') not in ['Not specified', '', None]
-            
-            critical_count = sum([has_title, has_deadline, has_amount])
+            critical_count = (
+                (title not in MISSING_TITLES)
+                + (deadline not in MISSING_VALUES)
+                + (amount not in MISSING_VALUES)
+            )
             if critical_count < 2:
                 issues.append(f"Insufficient data: {grant.get('title', 'unknown')} ({critical_count}/3 fields)")
         
@@ -255,9 +332,12 @@ async def main():
     
     tester = FilterTester()
     
-    await tester.test_demographic_filter()
-    await tester.test_relevance_accuracy()
-    await tester.test_data_completeness()
+    try:
+        await tester.test_demographic_filter()
+        await tester.test_relevance_accuracy()
+        await tester.test_data_completeness()
+    finally:
+        await tester.workflow.aclose()
     
     tester.print_summary()
 
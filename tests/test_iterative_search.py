@@ -11,19 +11,22 @@ Verifies:
 """
 
 import asyncio
-import sys
-import os
 import logging
+import os
+from contextlib import aclosing
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Add backend to path
-sys.path.insert(0, os.path.abspath('backend'))
-sys.path.insert(0, os.path.abspath('frontend'))
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from _helpers import run
+
+from backend.adk_agent import GrantSeekerWorkflow
+
+# Cap on in-flight search/extraction calls across all search attempts
+GS_CONCURRENCY = int(os.getenv("GS_CONCURRENCY", "20"))
 
-from adk_agent import GrantSeekerWorkflow
 
 async def test_iterative_search():
     print("\n" + "="*80)
@@ -44,30 +47,44 @@ async def test_iterative_search():
     print(f"Target: Minimum {min_results} relevant results")
     print(f"Filters: {filters}")
     
-    # Run the iterative search
+    # Run the iterative search, printing each grant as soon as it arrives
     try:
-        results = await workflow.run_with_minimum_results(
-            query=query,
-            filters=filters,
-            min_results=min_results
-        )
+        results = []
         
         print("\n" + "-"*40)
-        print(f"Total Results Found: {len(results)}")
+        print("Results (as found):")
         print("-"*40)
         
-        for i, grant in enumerate(results, 1):
-            title = grant.get('title', 'Unknown')
-            demos = grant.get('founder_demographics', [])
-            fit = grant.get('fit_score', 0)
-            url_valid = grant.get('url') is not None
-            deadline = grant.get('deadline', 'N/A')
-            
-            print(f"\n{i}. {title}")
-            print(f"   Fit Score: {fit}%")
-            print(f"   Deadline: {deadline}")
-            print(f"   Demographics: {demos}")
-            print(f"   URL Valid: {'✅' if url_valid else '❌'}")
+        # aclosing() closes the generator however the loop ends, which cancels
+        # the searches still running
+        async with aclosing(workflow.iter_minimum_results(
+            query=query,
+            filters=filters,
+            min_results=min_results,
+            concurrency=asyncio.BoundedSemaphore(GS_CONCURRENCY)
+        )) as grants:
+            async for grant in grants:
+                results.append(grant)
+                title = grant.get('title', 'Unknown')
+                demos = grant.get('founder_demographics', [])
+                fit = grant.get('fit_score', 0)
+                url_valid = grant.get('url') is not None
+                deadline = grant.get('deadline', 'N/A')
+                
+                # One write per grant instead of one per line
+                print(
+                    f"\n{len(results)}. {title}\n"
+                    f"   Fit Score: {fit}%\n"
+                    f"   Deadline: {deadline}\n"
+                    f"   Demographics: {demos}\n"
+                    f"   URL Valid: {'✅' if url_valid else '❌'}"
+                )
+                
+                if len(results) >= min_results:
+                    # Target met: stop here
+                    break
+        
+        print(f"\nTotal Results Found: {len(results)}")
             
         # Validation
         if len(results) >= min_results:
@@ -89,6 +106,8 @@ async def test_iterative_search():
         print(f"\n❌ ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        await workflow.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(test_iterative_search())
+    run(test_iterative_search())
@@ -9,14 +9,13 @@ Tests the new multi-strategy content extraction system with:
 """
 
 import asyncio
-import sys
 import os
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+import _bootstrap  # noqa: F401 - puts the project root on sys.path
+from _helpers import queued_logging, run
 
 from dotenv import load_dotenv
-from backend.tavily_client import TavilyClient
+from backend.tavily_client import shared_tavily_client
 from backend.content_extractor import RobustContentExtractor, is_viable_grant
 
 load_dotenv()
@@ -72,28 +71,35 @@ async def test_content_extraction():
         print("❌ TAVILY_API_KEY not set - cannot test")
         return
     
-    tavily = TavilyClient(api_key=tavily_api_key)
+    tavily = shared_tavily_client(tavily_api_key)
     extractor = RobustContentExtractor(tavily_client=tavily, timeout=30.0)
     
-    for name, url in TEST_URLS.items():
+    # The URLs are independent, so fetch them concurrently through the shared
+    # client and extractor, then report each one in order
+    probes = await asyncio.gather(
+        *(extractor.extract(url, min_length=200) for url in TEST_URLS.values()),
+        return_exceptions=True
+    )
+    
+    for (name, url), probe in zip(TEST_URLS.items(), probes):
         print(f"\n{'='*80}")
         print(f"Testing: {name}")
         print(f"URL: {url}")
         print(f"{'='*80}")
         
-        try:
-            content, method = await extractor.extract(url, min_length=200)
-            
-            if content:
-                print(f"✅ SUCCESS")
-                print(f"   Method: {method}")
-                print(f"   Length: {len(content)} chars")
-                print(f"   Preview: {content[:200]}...")
-            else:
-                print(f"❌ FAILED - No content extracted")
-                
-        except Exception as e:
-            print(f"❌ ERROR: {type(e).__name__}: {e}")
+        if isinstance(probe, Exception):
+            print(f"❌ ERROR: {type(probe).__name__}: {probe}")
+            continue
+        
+        content, method = probe
+        if content:
+            print(f"✅ SUCCESS")
+            print(f"   Method: {method}")
+            print(f"   Length: {len(content)} chars")
+            print(f"   Preview: {content[:200]}...")
+        else:
+            print(f"❌ FAILED - No content extracted")
+
 
 
 def test_grant_viability():
@@ -103,8 +109,7 @@ def test_grant_viability():
     print("=" * 80)
     
     for i, grant in enumerate(TEST_GRANTS, 1):
-        viable = is_viable_grant(grant)
-        status = "✅ VIABLE" if viable else "❌ FILTERED"
+        status = "✅ VIABLE" if is_viable_grant(grant) else "❌ FILTERED"
         
         print(f"\nGrant {i}: {grant['title']}")
         print(f"  Status: {status}")
@@ -122,10 +127,16 @@ async def main():
     # Test 2: Grant Viability
     test_grant_viability()
     
+    # Close the shared Tavily client's pooled connections once, after all tests
+    tavily_api_key = os.getenv("TAVILY_API_KEY")
+    if tavily_api_key:
+        await shared_tavily_client(tavily_api_key).aclose()
+    
     print("\n" + "=" * 80)
     print("TESTS COMPLETE")
     print("=" * 80)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with queued_logging():  # warnings and errors only, as before
+        run(main())